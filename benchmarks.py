@@ -0,0 +1,475 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import platform
+import random
+import time
+import warnings
+import numpy as np
+import matplotlib
+from blackjack_env import BlackjackEnv, Action
+from q_learning import QLearningAgent
+from learners import LEARNERS, QLambdaAgent, make_agent
+from dp_solver import solve, policy_agreement
+from rng import spawn_seeds
+from parallel import ParallelTrainer
+from vector_env import VectorBlackjackEnv
+from callbacks import Callback, RingBuffer
+
+
+def collect_transitions(num_transitions: int, seed: int = 0) -> dict:
+    env = VectorBlackjackEnv(num_envs=4096, rng=seed)
+    rng = np.random.default_rng(seed + 1)
+
+    batches = {'states': [], 'actions': [], 'rewards': [], 'next_states': [], 'dones': []}
+    states = env.reset()
+    collected = 0
+
+    while collected < num_transitions:
+        actions = rng.integers(0, 2, size=env.num_envs)
+        next_states, rewards, dones, info = env.step(actions)
+
+        batches['states'].append(states)
+        batches['actions'].append(actions)
+        batches['rewards'].append(rewards)
+        batches['next_states'].append(info['terminal_states'])
+        batches['dones'].append(dones)
+
+        states = next_states
+        collected += env.num_envs
+
+    return {key: np.concatenate(values)[:num_transitions] for key, values in batches.items()}
+
+
+def bench_update(num_transitions: int = 200000, batch_size: int = 4096, seed: int = 0) -> dict:
+    data = collect_transitions(num_transitions, seed)
+    results = {}
+
+    agent = QLearningAgent()
+    transitions = list(zip(data['states'].tolist(),
+                           [Action(a) for a in data['actions'].tolist()],
+                           data['rewards'].tolist(),
+                           data['next_states'].tolist(),
+                           data['dones'].tolist()))
+    start = time.perf_counter()
+    for s, a, r, s2, d in transitions:
+        agent.update(s, a, r, s2, d)
+    results['scalar'] = num_transitions / (time.perf_counter() - start)
+    scalar_Q = agent.Q.copy()
+
+    for mode in ('sequential', 'average'):
+        agent = QLearningAgent()
+        start = time.perf_counter()
+        for i in range(0, num_transitions, batch_size):
+            batch = slice(i, i + batch_size)
+            agent.update_batch(data['states'][batch], data['actions'][batch],
+                               data['rewards'][batch], data['next_states'][batch],
+                               data['dones'][batch], mode=mode)
+        results[mode] = num_transitions / (time.perf_counter() - start)
+
+        if mode == 'sequential':
+            assert np.array_equal(agent.Q, scalar_Q)
+
+    return results
+
+
+def bench_train(num_episodes: int = 100000, seed: int = 0) -> dict:
+    results = {}
+    tables = {}
+
+    for name, fast in (('normal', False), ('fast', True)):
+        random.seed(seed)
+        env = BlackjackEnv()
+        agent = QLearningAgent()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent.train(env, num_episodes, fast=fast)
+        results[name] = num_episodes / (time.perf_counter() - start)
+        tables[name] = agent.Q
+
+    assert np.array_equal(tables['normal'], tables['fast'])
+    return results
+
+
+def bench_learners(num_episodes: int = 100000, seed: int = 0) -> dict:
+    results = {}
+    for name in LEARNERS:
+        env = BlackjackEnv(rng=seed)
+        agent = make_agent(name, rng=seed + 1)
+
+        start = time.perf_counter()
+        agent.train(env, num_episodes, fast=True, verbose=False)
+        results[name] = num_episodes / (time.perf_counter() - start)
+    return results
+
+
+def _episodes_to_agreement(learner: str, seed: int, Q_star: np.ndarray, max_episodes: int,
+                           check_every: int, agreement: float, **kwargs) -> int:
+    env_seed, agent_seed = spawn_seeds(seed, 2)
+    env = BlackjackEnv(rng=env_seed)
+    agent = make_agent(learner, rng=agent_seed, **kwargs)
+    for episodes in range(check_every, max_episodes + 1, check_every):
+        agent._train_fast(env, check_every)
+        if policy_agreement(agent.Q, Q_star) >= agreement:
+            return episodes
+    return max_episodes
+
+
+def bench_credit_assignment(lams=(0.5, 0.9), num_seeds: int = 8, max_episodes: int = 50000,
+                            check_every: int = 250, agreement: float = 17 / 18) -> dict:
+    Q_star = solve(gamma=0.95)
+
+    # Todos os algoritmos de LEARNERS; o Q(lambda) uma vez por lambda
+    configs = []
+    for name in LEARNERS:
+        if name == QLambdaAgent.name:
+            configs += [(f'{name}({lam})', name, {'lam': lam}) for lam in lams]
+        else:
+            configs.append((name, name, {}))
+
+    results = {}
+    for label, learner, kwargs in configs:
+        results[label] = float(np.mean([
+            _episodes_to_agreement(learner, seed, Q_star, max_episodes, check_every, agreement, **kwargs)
+            for seed in range(num_seeds)
+        ]))
+    return results
+
+
+def bench_parallel(num_episodes: int = 400000, sync_every: int = 5000, seed: int = 0) -> dict:
+    results = {}
+    num_workers = 1
+
+    while num_workers <= mp.cpu_count():
+        agent = QLearningAgent()
+        trainer = ParallelTrainer(agent, num_workers=num_workers, sync_every=sync_every, seed=seed)
+
+        start = time.perf_counter()
+        trainer.train(num_episodes, verbose=False)
+        results[num_workers] = num_episodes / (time.perf_counter() - start)
+        num_workers *= 2
+
+    return results
+
+
+class _EpisodeCounter(Callback):
+
+    def __init__(self):
+        self.episodes = 0
+
+    def on_episode_end(self, agent, episode, reward, length):
+        self.episodes += 1
+
+
+def bench_callbacks(num_episodes: int = 200000, repeats: int = 5, seed: int = 0) -> dict:
+    variants = {
+        'nenhum': lambda: None,
+        'lista vazia': lambda: [],
+        'ring buffer': lambda: [RingBuffer()],
+        'por episódio': lambda: [_EpisodeCounter()],
+    }
+    results = {}
+    tables = {}
+
+    for name, make_callbacks in variants.items():
+        best = float('inf')
+        for _ in range(repeats):
+            env = BlackjackEnv(rng=seed)
+            agent = QLearningAgent(rng=seed + 1)
+            callbacks = make_callbacks()
+
+            start = time.perf_counter()
+            agent.train(env, num_episodes, fast=True, verbose=False, callbacks=callbacks)
+            best = min(best, time.perf_counter() - start)
+
+        results[name] = num_episodes / best
+        tables[name] = agent.Q
+
+    for Q in tables.values():
+        assert np.array_equal(Q, tables['nenhum'])
+    return results
+
+
+def _best_time(fn, repeats: int = 5, warmup: int = 1) -> float:
+    for _ in range(warmup):
+        fn()
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_env(num_episodes: int = 50000, num_envs: int = 4096, repeats: int = 5, seed: int = 0) -> dict:
+    results = {}
+
+    for name, make_env in (('legado', lambda: BlackjackEnv()),
+                           ('semeado', lambda: BlackjackEnv(rng=seed)),
+                           ('sapato', lambda: BlackjackEnv(rng=seed, num_decks=6)),
+                           ('amostrado', lambda: BlackjackEnv(rng=seed, dealer_mode='sample')),
+                           ('esperado', lambda: BlackjackEnv(rng=seed, dealer_mode='expected'))):
+        env = make_env()
+        reset = env.reset
+        step = env.step
+        stand = Action.STAND
+
+        def resets():
+            for _ in range(num_episodes):
+                reset()
+
+        def episodes():
+            for _ in range(num_episodes):
+                reset()
+                step(stand)
+
+        random.seed(seed)
+        results[f'reset_{name}'] = num_episodes / _best_time(resets, repeats)
+        results[f'reset_step_{name}'] = num_episodes / _best_time(episodes, repeats)
+
+    env = VectorBlackjackEnv(num_envs=num_envs, rng=seed)
+    actions = np.random.default_rng(seed).integers(0, 2, size=num_envs)
+    num_steps = max(1, num_episodes // num_envs)
+
+    def vector_steps():
+        for _ in range(num_steps):
+            env.step(actions)
+
+    results['vector_step'] = num_steps * num_envs / _best_time(vector_steps, repeats)
+
+    env = VectorBlackjackEnv(num_envs=num_envs, rng=seed, num_decks=6)
+    results['vector_step_sapato'] = num_steps * num_envs / _best_time(vector_steps, repeats)
+    return results
+
+
+def bench_agent_calls(num_calls: int = 100000, repeats: int = 5, seed: int = 0) -> dict:
+    data = collect_transitions(num_calls, seed)
+    states = data['states'].tolist()
+    transitions = list(zip(states,
+                           [Action(a) for a in data['actions'].tolist()],
+                           data['rewards'].tolist(),
+                           data['next_states'].tolist(),
+                           data['dones'].tolist()))
+
+    agent = QLearningAgent(epsilon=0.1, rng=seed)
+    get_action = agent.get_action
+    update = agent.update
+
+    def actions():
+        for s in states:
+            get_action(s)
+
+    def updates():
+        for s, a, r, s2, d in transitions:
+            update(s, a, r, s2, d)
+
+    return {
+        'get_action_ns': 1e9 * _best_time(actions, repeats) / num_calls,
+        'update_ns': 1e9 * _best_time(updates, repeats) / num_calls,
+    }
+
+
+def bench_train_scaling(sizes=(10 ** 4, 10 ** 5, 10 ** 6), normal_limit: int = 10 ** 5, seed: int = 0) -> dict:
+    results = {}
+    for num_episodes in sizes:
+        for name, fast in (('normal', False), ('fast', True)):
+            if not fast and num_episodes > normal_limit:
+                continue
+
+            env = BlackjackEnv(rng=seed)
+            agent = QLearningAgent(rng=seed + 1)
+            agent.train(env, min(num_episodes, 1000), fast=fast, verbose=False)
+
+            agent = QLearningAgent(rng=seed + 1)
+            start = time.perf_counter()
+            agent.train(env, num_episodes, fast=fast, verbose=False)
+            results[f'{name}_{num_episodes}'] = num_episodes / (time.perf_counter() - start)
+    return results
+
+
+def bench_get_stats(checkpoints=(10 ** 3, 10 ** 4, 10 ** 5), num_calls: int = 10000, seed: int = 0) -> dict:
+    results = {}
+    env = BlackjackEnv(rng=seed)
+    agent = QLearningAgent(rng=seed + 1)
+    get_stats = agent.get_stats
+
+    def calls():
+        for _ in range(num_calls):
+            get_stats()
+
+    for total in checkpoints:
+        agent.train(env, total - agent.total_episodes, fast=True, verbose=False)
+        results[total] = 1e9 * _best_time(calls) / num_calls
+    return results
+
+
+def bench_render(repeats: int = 10, history: int = 1000, seed: int = 0) -> dict:
+    with warnings.catch_warnings():
+        # emojis dos títulos não existem na fonte padrão do Agg
+        warnings.simplefilter('ignore', UserWarning)
+        return _bench_render(repeats, history, seed)
+
+
+def _bench_render(repeats: int, history: int, seed: int) -> dict:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from plots import HeatmapRenderer, LearningCurvesRenderer
+
+    rng = np.random.default_rng(seed)
+    tables = [rng.uniform(-1, 1, size=(18, 2)) for _ in range(repeats + 1)]
+    episodes = list(range(100, 100 * (history + 1), 100))
+    rewards = rng.uniform(-0.2, 0.1, size=history).tolist()
+    win_rates = rng.uniform(0.35, 0.45, size=history).tolist()
+    epsilons = np.geomspace(1.0, 0.01, history).tolist()
+    results = {}
+
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    heatmap = HeatmapRenderer(fig)
+    fig.canvas.draw()
+    heatmap.update(tables[0])
+
+    def heatmap_updates():
+        for Q in tables[1:]:
+            heatmap.update(Q)
+
+    # Pior caso de uma atualização por blit: tabelas sorteadas mudam a cor e o rótulo das 36
+    # células; o Agg não tem tela, então não entra a cópia do buffer para a janela
+    results['heatmap_update_ms'] = 1e3 * _best_time(heatmap_updates, 3) / repeats
+    results['heatmap_full_draw_ms'] = 1e3 * _best_time(fig.canvas.draw, 3)
+
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    fig.subplots_adjust(hspace=0.4)
+    graphs = LearningCurvesRenderer(fig, fps=1e9)
+    graphs.update(episodes, rewards, win_rates, epsilons, tables[0], force=True)
+    fig.canvas.draw()
+
+    def graph_updates():
+        for Q in tables[1:]:
+            graphs.update(episodes, rewards, win_rates, epsilons, Q, force=True)
+
+    results['graphs_update_ms'] = 1e3 * _best_time(graph_updates, 3) / repeats
+    results['graphs_full_draw_ms'] = 1e3 * _best_time(fig.canvas.draw, 3)
+
+    results['table_update_ms'] = _bench_table(tables, repeats)
+    return results
+
+
+def _bench_table(tables: list, repeats: int):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+
+    try:
+        root.withdraw()
+        from main import ModernQLearningGUI
+        from snapshot import TrainingHistory, TrainingSnapshot
+
+        gui = ModernQLearningGUI(root)
+        snapshots = [TrainingSnapshot(Q, {}, TrainingHistory().freeze()) for Q in tables]
+
+        def table_updates():
+            for snapshot in snapshots[1:]:
+                gui.update_table(snapshot)
+                root.update_idletasks()
+
+        return 1e3 * _best_time(table_updates, 3) / repeats
+    finally:
+        root.destroy()
+
+
+def environment_info() -> dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpu_count': mp.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+SUITE = {
+    'env': bench_env,
+    'agent_calls': bench_agent_calls,
+    'update': bench_update,
+    'train': bench_train,
+    'train_scaling': bench_train_scaling,
+    'learners': bench_learners,
+    'credit_assignment': bench_credit_assignment,
+    'get_stats': bench_get_stats,
+    'callbacks': bench_callbacks,
+    'render': bench_render,
+    'parallel': bench_parallel,
+}
+
+QUICK = {
+    'env': dict(num_episodes=5000, repeats=3),
+    'agent_calls': dict(num_calls=10000, repeats=3),
+    'update': dict(num_transitions=20000),
+    'train': dict(num_episodes=5000),
+    'train_scaling': dict(sizes=(10 ** 4,), normal_limit=10 ** 4),
+    'learners': dict(num_episodes=10000),
+    'credit_assignment': dict(lams=(0.5,), num_seeds=2, max_episodes=5000),
+    'get_stats': dict(checkpoints=(10 ** 3, 10 ** 4), num_calls=1000),
+    'callbacks': dict(num_episodes=10000, repeats=2),
+    'render': dict(repeats=3, history=100),
+    'parallel': dict(num_episodes=20000, sync_every=1000),
+}
+
+
+def run_suite(names=None, quick: bool = False) -> dict:
+    results = {'environment': environment_info()}
+    for name in names or SUITE:
+        kwargs = QUICK[name] if quick else {}
+        results[name] = SUITE[name](**kwargs)
+    return results
+
+
+def _print_section(title: str, values: dict, unit: str):
+    print("\n" + "=" * 50)
+    print(title)
+    print("=" * 50)
+    for key, value in values.items():
+        if value is None:
+            print(f"  {key:<24} {'indisponível':>16}")
+        else:
+            print(f"  {str(key):<24} {value:>16,.2f} {unit}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do Q-Learning Blackjack.")
+    parser.add_argument('--output', default=None, help="arquivo JSON para gravar os resultados")
+    parser.add_argument('--only', nargs='+', choices=list(SUITE), default=None, help="executar só estes benchmarks")
+    parser.add_argument('--quick', action='store_true', help="tamanhos reduzidos (verificação rápida)")
+    args = parser.parse_args()
+
+    results = run_suite(args.only, args.quick)
+
+    units = {
+        'env': 'chamadas/s',
+        'agent_calls': 'ns/chamada',
+        'update': 'transições/s',
+        'train': 'episódios/s',
+        'train_scaling': 'episódios/s',
+        'learners': 'episódios/s',
+        'credit_assignment': 'episódios até concordar com Q* (média)',
+        'get_stats': 'ns/chamada (por episódios treinados)',
+        'callbacks': 'episódios/s',
+        'render': 'ms',
+        'parallel': 'episódios/s (por processos)',
+    }
+    for name, values in results.items():
+        if name != 'environment':
+            _print_section(f"Benchmark: {name}", values, units[name])
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados gravados em {args.output}")
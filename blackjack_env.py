@@ -1,6 +1,63 @@
 import random
+import numpy as np
+from bisect import bisect_right
 from enum import Enum
-from typing import Tuple, Dict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from rng import make_generator, SeedLike
+from shoe import Shoe
+from dp_solver import DEALER_OUTCOMES, dealer_final_distribution
+
+
+_getrandbits = random.getrandbits
+
+NUM_PLAYER_TOTALS = 18
+NUM_DEALER_CARDS = 10
+EXTENDED_NUM_STATES = NUM_PLAYER_TOTALS * NUM_DEALER_CARDS * 2
+
+# Probabilidade de cada carta aberta do dealer (ás = 1, figuras valem 10)
+DEALER_CARD_PROBS = np.array([1.0] * 9 + [4.0]) / 13.0
+
+DEALER_MODES = ('simulate', 'sample', 'expected')
+
+
+def encode_state(player_value: int, dealer_card: int, usable_ace: bool) -> int:
+    player_value = min(max(player_value, 4), 21)
+    return ((player_value - 4) * NUM_DEALER_CARDS + dealer_card - 1) * 2 + usable_ace
+
+
+def decode_state(state: int) -> Tuple[int, int, bool]:
+    rest, usable_ace = divmod(state, 2)
+    player_index, dealer_index = divmod(rest, NUM_DEALER_CARDS)
+    return player_index + 4, dealer_index + 1, bool(usable_ace)
+
+
+@lru_cache(maxsize=None)
+def dealer_tables() -> Tuple[List[List[float]], List[List[float]]]:
+    cdfs = [[1.0] * len(DEALER_OUTCOMES) for _ in range(21)]
+    expected = [[0.0] * 22 for _ in range(21)]
+    
+    for start_total in range(2, 21):
+        dist = dealer_final_distribution(start_total)
+        cdfs[start_total] = np.cumsum(dist).tolist()
+        for player_total in range(22):
+            reward = dist[-1] + sum(p * np.sign(player_total - total)
+                                    for p, total in zip(dist[:-1], DEALER_OUTCOMES[:-1]))
+            expected[start_total][player_total] = float(reward)
+    
+    return cdfs, expected
+
+
+def project_q(Q: np.ndarray) -> np.ndarray:
+    Q = np.asarray(Q)
+    if Q.shape[0] == NUM_PLAYER_TOTALS:
+        return Q
+    if Q.shape[0] != EXTENDED_NUM_STATES:
+        raise ValueError(f"Tabela Q com {Q.shape[0]} estados não tem projeção conhecida.")
+    
+    # Mãos duras, ponderadas pela distribuição da carta aberta do dealer
+    hard = Q.reshape(NUM_PLAYER_TOTALS, NUM_DEALER_CARDS, 2, -1)[:, :, 0, :]
+    return np.tensordot(DEALER_CARD_PROBS, hard, axes=([0], [1]))
 
 
 class Action(Enum):
@@ -10,13 +67,56 @@ class Action(Enum):
 
 class BlackjackEnv:
     
-    def __init__(self):
-        self.num_states = 18
+    def __init__(
+        self,
+        rng: SeedLike = None,
+        block_size: int = 4096,
+        extended_state: bool = False,
+        num_decks: Optional[int] = None,
+        penetration: float = 0.75,
+        dealer_mode: str = 'simulate'
+    ):
+        if dealer_mode not in DEALER_MODES:
+            raise ValueError(f"dealer_mode desconhecido: {dealer_mode!r}. Use um de {DEALER_MODES}.")
+        if dealer_mode != 'simulate' and (extended_state or num_decks is not None):
+            raise ValueError(f"dealer_mode={dealer_mode!r} só é suportado no estado padrão com baralho infinito.")
+        
+        self.extended_state = extended_state
+        self.num_states = EXTENDED_NUM_STATES if extended_state else NUM_PLAYER_TOTALS
         self.num_actions = 2
+        self.player_ace = False
+        
+        self.rng = None
+        if rng is not None:
+            self.rng = make_generator(rng)
+            self.block_size = block_size
+            self._cards = []
+            self._card_pos = 0
+            self._draw_card = self._draw_block_card
         
-        self.state_mapping = {i: i - 4 for i in range(4, 22)}
         self.reverse_state_mapping = {i - 4: i for i in range(4, 22)}
         
+        if extended_state:
+            self.reset = self._reset_extended
+            self.step_fast = self._step_fast_extended
+        
+        self.shoe = None
+        if num_decks is not None:
+            self.shoe = Shoe(num_decks, penetration, rng=self.rng)
+            self._draw_card = self.shoe.draw
+            self._deal = self.reset
+            self.reset = self._reset_shoe
+        
+        self.dealer_mode = dealer_mode
+        if dealer_mode != 'simulate':
+            self._dealer_cdfs, self._expected_rewards = dealer_tables()
+            if self.rng is None:
+                self._uniform = random.random
+            else:
+                # random.Random semeado a partir de rng: reprodutível e sem custo de método Python por sorteio
+                self._uniform = random.Random(int(self.rng.integers(2 ** 63))).random
+            self.step_fast = self._step_fast_sampled if dealer_mode == 'sample' else self._step_fast_expected
+        
         self.reset()
         
     def reset(self) -> int:
@@ -24,47 +124,101 @@ class BlackjackEnv:
         self.dealer_hand = self._draw_card()
         self.dealer_hidden = self._draw_card()
         self.done = False
+        self.result = None
+        self.dealer_total = None
         
         return self._get_state()
     
+    def _reset_shoe(self) -> int:
+        self.shoe.start_round()
+        return self._deal()
+    
     def _draw_card(self) -> int:
-        card = random.randint(1, 13)
+        # Mesma sequência de random.randint(1, 13), sem o custo de randrange
+        card = _getrandbits(4)
+        while card >= 13:
+            card = _getrandbits(4)
+        card += 1
         if card > 10:
             return 10
         return card
     
+    def _draw_block_card(self) -> int:
+        pos = self._card_pos
+        if pos == len(self._cards):
+            self._cards = np.minimum(self.rng.integers(1, 14, size=self.block_size), 10).tolist()
+            pos = 0
+        self._card_pos = pos + 1
+        return self._cards[pos]
+    
     def _get_state(self) -> int:
         player_value = self._calculate_hand_value(self.player_hand)
         
         if player_value < 4:
-            player_value = 4
+            return 0
         elif player_value > 21:
-            player_value = 21
+            return 17
         
-        return self.state_mapping.get(player_value, 0)
+        return player_value - 4
     
-    def _calculate_hand_value(self, hand: int) -> int:
+    def _calculate_hand_value(self, hand: int, has_ace: bool = False) -> int:
+        if has_ace and hand <= 11:
+            return hand + 10
         return hand
     
+    def _reset_extended(self) -> int:
+        first = self._draw_card()
+        second = self._draw_card()
+        self.player_hand = first + second
+        self.player_ace = first == 1 or second == 1
+        self.dealer_hand = self._draw_card()
+        self.dealer_hidden = self._draw_card()
+        self.done = False
+        self.result = None
+        self.dealer_total = None
+        
+        return self._get_extended_state()
+    
+    def _get_extended_state(self) -> int:
+        usable_ace = self.player_ace and self.player_hand <= 11
+        return encode_state(self.player_value(), self.dealer_hand, usable_ace)
+    
+    def player_value(self) -> int:
+        return self._calculate_hand_value(self.player_hand, self.player_ace)
+    
     def step(self, action: Action) -> Tuple[int, float, bool, Dict]:
+        new_state, reward, done = self.step_fast(action.value)
+        
+        info = {}
+        if self.result is not None:
+            info['result'] = self.result
+        
+        info['player_hand'] = self.player_hand
+        info['dealer_showing'] = self.dealer_hand
+        if self.shoe is not None:
+            info['true_count'] = self.shoe.true_count
+        if self.done:
+            info['dealer_total'] = self.dealer_total
+        
+        return new_state, reward, done, info
+    
+    def step_fast(self, action: int) -> Tuple[int, float, bool]:
         if self.done:
             raise ValueError("Episódio já terminou. Chame reset() primeiro.")
         
         reward = 0.0
-        info = {}
+        self.result = None
+        self.dealer_total = None
         
-        if action == Action.HIT:
-            new_card = self._draw_card()
-            self.player_hand += new_card
+        if action == 0:
+            self.player_hand += self._draw_card()
             
             if self.player_hand > 21:
                 self.done = True
                 reward = -1.0
-                info['result'] = 'bust'
-            else:
-                reward = 0.0
+                self.result = 'bust'
                 
-        elif action == Action.STAND:
+        elif action == 1:
             self.done = True
             
             dealer_total = self.dealer_hand + self.dealer_hidden
@@ -73,30 +227,112 @@ class BlackjackEnv:
                 if dealer_total > 21:
                     dealer_total = -1
                     break
+            self.dealer_total = dealer_total
             
             if dealer_total == -1:
                 reward = 1.0
-                info['result'] = 'dealer_bust'
+                self.result = 'dealer_bust'
             elif dealer_total > self.player_hand:
                 reward = -1.0
-                info['result'] = 'dealer_wins'
+                self.result = 'dealer_wins'
             elif dealer_total < self.player_hand:
                 reward = 1.0
-                info['result'] = 'player_wins'
+                self.result = 'player_wins'
+            else:
+                self.result = 'tie'
+        
+        return self._get_state(), reward, self.done
+    
+    def _step_fast_sampled(self, action: int) -> Tuple[int, float, bool]:
+        if action != 1 or self.done:
+            return BlackjackEnv.step_fast(self, action)
+        
+        self.done = True
+        # Uma busca na CDF do total final do dealer substitui o laço de compra de cartas
+        index = bisect_right(self._dealer_cdfs[self.dealer_hand + self.dealer_hidden], self._uniform())
+        player_value = self.player_hand
+        
+        if index == 5:
+            self.dealer_total = -1
+            self.result = 'dealer_bust'
+            reward = 1.0
+        else:
+            dealer_total = self.dealer_total = index + 17
+            if dealer_total > player_value:
+                self.result = 'dealer_wins'
+                reward = -1.0
+            elif dealer_total < player_value:
+                self.result = 'player_wins'
+                reward = 1.0
             else:
+                self.result = 'tie'
                 reward = 0.0
-                info['result'] = 'tie'
         
-        new_state = self._get_state()
+        return self._get_state(), reward, True
+    
+    def _step_fast_expected(self, action: int) -> Tuple[int, float, bool]:
+        if action != 1 or self.done:
+            return BlackjackEnv.step_fast(self, action)
         
-        info['player_hand'] = self.player_hand
-        info['dealer_showing'] = self.dealer_hand
+        self.done = True
+        self.dealer_total = None
+        self.result = 'expected'
+        reward = self._expected_rewards[self.dealer_hand + self.dealer_hidden][self.player_hand]
+        return self._get_state(), reward, True
+    
+    def _step_fast_extended(self, action: int) -> Tuple[int, float, bool]:
         if self.done:
-            info['dealer_total'] = dealer_total if action == Action.STAND else None
+            raise ValueError("Episódio já terminou. Chame reset() primeiro.")
+        
+        reward = 0.0
+        self.result = None
+        self.dealer_total = None
+        
+        if action == 0:
+            card = self._draw_card()
+            self.player_hand += card
+            if card == 1:
+                self.player_ace = True
+            
+            if self.player_hand > 21:
+                self.done = True
+                reward = -1.0
+                self.result = 'bust'
+                
+        elif action == 1:
+            self.done = True
+            player_value = self.player_value()
+            
+            dealer_hard = self.dealer_hand + self.dealer_hidden
+            dealer_ace = self.dealer_hand == 1 or self.dealer_hidden == 1
+            dealer_total = self._calculate_hand_value(dealer_hard, dealer_ace)
+            while dealer_total < 17:
+                card = self._draw_card()
+                dealer_hard += card
+                if card == 1:
+                    dealer_ace = True
+                dealer_total = self._calculate_hand_value(dealer_hard, dealer_ace)
+            if dealer_total > 21:
+                dealer_total = -1
+            self.dealer_total = dealer_total
+            
+            if dealer_total == -1:
+                reward = 1.0
+                self.result = 'dealer_bust'
+            elif dealer_total > player_value:
+                reward = -1.0
+                self.result = 'dealer_wins'
+            elif dealer_total < player_value:
+                reward = 1.0
+                self.result = 'player_wins'
+            else:
+                self.result = 'tie'
         
-        return new_state, reward, self.done, info
+        return self._get_extended_state(), reward, self.done
     
     def get_state_value(self, state: int) -> int:
+        if self.extended_state:
+            return decode_state(state)[0]
         return self.reverse_state_mapping.get(state, 4)
     
     def render(self) -> str:
@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+import time
+import numpy as np
+from collections import deque
+from typing import Iterable, Optional, Sequence
+
+
+class Callback:
+
+    def on_episode_end(self, agent, episode: int, reward: float, length: int):
+        pass
+
+    def on_batch_end(self, agent, metrics: dict):
+        pass
+
+    def on_checkpoint(self, agent, path: str):
+        pass
+
+
+def _overrides(callback: Callback, hook: str) -> bool:
+    return getattr(type(callback), hook) is not getattr(Callback, hook)
+
+
+class CallbackList:
+
+    def __init__(self, callbacks: Iterable[Callback]):
+        self.callbacks = list(callbacks)
+        self.episode_callbacks = [cb for cb in self.callbacks if _overrides(cb, 'on_episode_end')]
+        self.batch_callbacks = [cb for cb in self.callbacks if _overrides(cb, 'on_batch_end')]
+        self.checkpoint_callbacks = [cb for cb in self.callbacks if _overrides(cb, 'on_checkpoint')]
+        self._start_time = None
+
+    @property
+    def wants_episodes(self) -> bool:
+        return bool(self.episode_callbacks)
+
+    def _counters(self, agent) -> tuple:
+        stats = agent.stats
+        return agent.total_episodes, stats.total_steps, stats.total_reward, stats.total_wins
+
+    def begin(self, agent):
+        self._start_time = time.perf_counter()
+        self._start = self._last = self._counters(agent)
+
+    def episodes_end(self, agent, first_episode: int, rewards: Sequence[float], lengths: Sequence[int]):
+        for callback in self.episode_callbacks:
+            for i, (reward, length) in enumerate(zip(rewards, lengths)):
+                callback.on_episode_end(agent, first_episode + i, reward, length)
+
+    def batch_end(self, agent) -> dict:
+        counters = self._counters(agent)
+        episodes, steps, reward, wins = (now - last for now, last in zip(counters, self._last))
+        elapsed = time.perf_counter() - self._start_time
+        run_episodes = counters[0] - self._start[0]
+        run_steps = counters[1] - self._start[1]
+        self._last = counters
+
+        metrics = {
+            'episode': counters[0],
+            'batch_episodes': episodes,
+            'batch_steps': steps,
+            'batch_reward': reward,
+            'batch_wins': wins,
+            'avg_reward': agent.stats.avg_reward,
+            'avg_length': agent.stats.avg_length,
+            'win_rate': agent.stats.win_rate,
+            'epsilon': agent.epsilon,
+            'elapsed': elapsed,
+            'episodes_per_s': run_episodes / elapsed if elapsed > 0 else 0.0,
+            'steps_per_s': run_steps / elapsed if elapsed > 0 else 0.0,
+        }
+        for callback in self.batch_callbacks:
+            callback.on_batch_end(agent, metrics)
+        return metrics
+
+    def checkpoint(self, agent, path: str):
+        for callback in self.checkpoint_callbacks:
+            callback.on_checkpoint(agent, path)
+
+
+class MetricsWriter(Callback):
+
+    def __init__(self, path: str, format: Optional[str] = None):
+        if format is None:
+            format = 'csv' if path.endswith('.csv') else 'jsonl'
+        if format not in ('csv', 'jsonl'):
+            raise ValueError(f"Formato desconhecido: {format!r}. Use 'csv' ou 'jsonl'.")
+
+        self.path = path
+        self.format = format
+        self._fields = None
+
+    def write(self, record: dict):
+        with open(self.path, 'a', newline='') as f:
+            if self.format == 'jsonl':
+                f.write(json.dumps(record) + "\n")
+                return
+
+            if self._fields is None:
+                self._fields = list(record)
+                if os.path.getsize(self.path) == 0:
+                    csv.writer(f).writerow(self._fields)
+            csv.DictWriter(f, fieldnames=self._fields, extrasaction='ignore').writerow(record)
+
+    def on_batch_end(self, agent, metrics: dict):
+        self.write({'event': 'batch', **metrics})
+
+    def on_checkpoint(self, agent, path: str):
+        if self.format == 'jsonl':
+            self.write({'event': 'checkpoint', 'episode': agent.total_episodes, 'path': path})
+
+
+class RingBuffer(Callback):
+
+    def __init__(self, maxlen: int = 1000):
+        self.records = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def on_batch_end(self, agent, metrics: dict):
+        self.records.append(metrics)
+
+    def latest(self) -> Optional[dict]:
+        return self.records[-1] if self.records else None
+
+    def column(self, name: str) -> np.ndarray:
+        return np.array([record[name] for record in self.records])
+
+
+def as_callback_list(callbacks: Optional[Iterable[Callback]]) -> Optional[CallbackList]:
+    if callbacks is None:
+        return None
+    if isinstance(callbacks, CallbackList):
+        return callbacks
+    callbacks = list(callbacks)
+    return CallbackList(callbacks) if callbacks else None
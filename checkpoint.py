@@ -0,0 +1,64 @@
+import json
+import os
+import struct
+import numpy as np
+from typing import Dict, Tuple
+
+
+MAGIC = b'QLBJ'
+VERSION = 1
+PREFIX = struct.Struct('<4sIQ')
+ALIGNMENT = 64
+
+
+def write_checkpoint(path: str, header: Dict, arrays: Dict[str, np.ndarray]):
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+        offset += array.nbytes
+
+    header = dict(header, arrays=layout)
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_offset = PREFIX.size + len(header_bytes)
+    padding = -data_offset % ALIGNMENT
+    header_bytes += b' ' * padding
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for array in arrays.values():
+            f.write(array.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def read_header(path: str) -> Tuple[Dict, int]:
+    with open(path, 'rb') as f:
+        magic, version, header_len = PREFIX.unpack(f.read(PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um checkpoint de QLearningAgent.")
+        if version != VERSION:
+            raise ValueError(f"Versão de checkpoint não suportada: {version}.")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+
+    return header, PREFIX.size + header_len
+
+
+def read_array(path: str, header: Dict, data_offset: int, name: str, mmap: bool = False) -> np.ndarray:
+    spec = header['arrays'][name]
+    dtype = np.dtype(spec['dtype'])
+    shape = tuple(spec['shape'])
+    offset = data_offset + spec['offset']
+
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    count = int(np.prod(shape))
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return np.fromfile(f, dtype=dtype, count=count).reshape(shape)
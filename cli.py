@@ -0,0 +1,212 @@
+import argparse
+import os
+import sys
+import numpy as np
+from typing import List, Optional
+from blackjack_env import BlackjackEnv
+from learners import LEARNERS, make_agent
+from checkpoint import read_header
+from parallel import ParallelTrainer
+from rng import spawn_seeds
+from callbacks import Callback, MetricsWriter
+from profiler import PhaseProfiler
+
+
+# Hiperparâmetros do agente: sem default no parser para detectar uso explícito junto com --resume
+AGENT_DEFAULTS = {
+    'alpha': 0.1,
+    'gamma': 0.95,
+    'epsilon': 1.0,
+    'epsilon_decay': 0.995,
+    'epsilon_min': 0.01,
+    'stats_window': 1000,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Treinamento Q-Learning de Blackjack sem interface gráfica."
+    )
+    parser.add_argument('--learner', choices=list(LEARNERS), default='q_learning',
+                        help="algoritmo de aprendizado")
+    parser.add_argument('--lam', type=float, default=None,
+                        help="lambda dos traços de elegibilidade, só com --learner q_lambda (padrão: 0.5)")
+    parser.add_argument('--episodes', type=int, default=100000, help="número de episódios de treinamento")
+    parser.add_argument('--alpha', type=float, default=None, help="taxa de aprendizado (padrão: 0.1)")
+    parser.add_argument('--gamma', type=float, default=None, help="fator de desconto (padrão: 0.95)")
+    parser.add_argument('--epsilon', type=float, default=None, help="epsilon inicial (padrão: 1.0)")
+    parser.add_argument('--epsilon-decay', type=float, default=None,
+                        help="decaimento do epsilon por episódio (padrão: 0.995)")
+    parser.add_argument('--epsilon-min', type=float, default=None, help="epsilon mínimo (padrão: 0.01)")
+    parser.add_argument('--extended-state', action='store_true',
+                        help="estado estendido: total do jogador x carta do dealer x ás utilizável (360 estados)")
+    parser.add_argument('--decks', type=int, default=None,
+                        help="jogar com um sapato de N baralhos (omitido: baralho infinito)")
+    parser.add_argument('--penetration', type=float, default=0.75,
+                        help="fração do sapato distribuída antes da carta de corte")
+    parser.add_argument('--dealer-mode', choices=('simulate', 'sample', 'expected'), default='simulate',
+                        help="resolução do STAND: simular o dealer, sortear o total final em cache ou "
+                             "usar a recompensa esperada exata")
+    parser.add_argument('--stats-window', type=int, default=None,
+                        help="janela das estatísticas recentes (padrão: 1000)")
+    parser.add_argument('--seed', type=int, default=None, help="semente (omitida: aleatório global, não reprodutível)")
+    parser.add_argument('--workers', type=int, default=1, help="processos de treinamento (>1 usa ParallelTrainer)")
+    parser.add_argument('--sync-every', type=int, default=1000, help="episódios por processo entre sincronizações")
+    parser.add_argument('--merge', choices=('visits', 'average'), default='visits',
+                        help="combinação das tabelas Q no modo paralelo")
+    parser.add_argument('--fast', action=argparse.BooleanOptionalAction, default=True,
+                        help="usar o caminho rápido de treinamento")
+    parser.add_argument('--log-every', type=int, default=10000, help="episódios entre registros de métricas")
+    parser.add_argument('--checkpoint-every', type=int, default=None,
+                        help="episódios entre checkpoints intermediários (modo de um processo)")
+    parser.add_argument('--output', default='runs', help="diretório de saída (métricas e checkpoint)")
+    parser.add_argument('--resume', default=None, help="checkpoint para continuar o treinamento")
+    parser.add_argument('--profile', action='store_true',
+                        help="medir o tempo por fase (env, ação, update, estatísticas) e gravar profile.json")
+    parser.add_argument('--profile-every', type=int, default=100, help="amostrar 1 a cada N episódios no perfil")
+    parser.add_argument('--quiet', action='store_true', help="não imprimir progresso")
+    return parser
+
+
+class _Reporter(Callback):
+
+    def __init__(self, writer: MetricsWriter, start_episode: int, num_episodes: int, log_every: int, quiet: bool):
+        self.writer = writer
+        self.start_episode = start_episode
+        self.num_episodes = num_episodes
+        self.log_every = log_every
+        self.quiet = quiet
+        self.last = None
+        self._next = log_every
+
+    def emit(self, record: dict):
+        self.writer.write(record)
+        if not self.quiet:
+            print(_progress_line(record))
+
+    def on_batch_end(self, agent, metrics: dict):
+        self.last = metrics
+        done = metrics['episode'] - self.start_episode
+        if self._next <= done < self.num_episodes:
+            self._next = (done // self.log_every + 1) * self.log_every
+            self.emit({'event': 'progress', **metrics})
+
+    def on_checkpoint(self, agent, path: str):
+        self.writer.on_checkpoint(agent, path)
+
+
+def _progress_line(record: dict) -> str:
+    return (f"Episódio {record['episode']} | "
+            f"Recompensa média: {record['avg_reward']:.3f} | "
+            f"Taxa de vitória: {record['win_rate'] * 100:.1f}% | "
+            f"Epsilon: {record['epsilon']:.3f} | "
+            f"{record['episodes_per_s']:,.0f} episódios/s | "
+            f"{record['steps_per_s']:,.0f} passos/s")
+
+
+def run(args: argparse.Namespace) -> dict:
+    if args.episodes <= 0:
+        raise ValueError("O número de episódios deve ser positivo.")
+    if args.profile and args.workers > 1:
+        raise ValueError("--profile só é suportado com um único processo (--workers 1).")
+    if args.workers > 1 and args.learner != 'q_learning':
+        raise ValueError("O modo paralelo (--workers > 1) só suporta --learner q_learning.")
+    if args.lam is not None and args.learner != 'q_lambda':
+        raise ValueError("--lam só se aplica a --learner q_lambda.")
+    if args.lam is not None and args.resume is not None:
+        raise ValueError("--resume usa o lambda salvo no checkpoint; remova --lam.")
+    explicit = [name for name in AGENT_DEFAULTS if getattr(args, name) is not None]
+    if args.resume is not None and explicit:
+        flags = ", ".join('--' + name.replace('_', '-') for name in explicit)
+        raise ValueError(f"--resume usa os hiperparâmetros salvos no checkpoint; remova {flags}.")
+
+    os.makedirs(args.output, exist_ok=True)
+    metrics_path = os.path.join(args.output, 'metrics.jsonl')
+    checkpoint_path = os.path.join(args.output, 'agent.qlbj')
+
+    seed = args.seed
+    if seed is not None and args.resume is not None:
+        # Inclui os episódios já jogados para a retomada não repetir as mãos do início do treino
+        seed = np.random.SeedSequence([seed, read_header(args.resume)[0]['total_episodes']])
+    env_seed, agent_seed = spawn_seeds(seed, 2) if seed is not None else (None, None)
+    env_kwargs = {
+        'extended_state': args.extended_state,
+        'num_decks': args.decks,
+        'penetration': args.penetration,
+        'dealer_mode': args.dealer_mode,
+    }
+    env = BlackjackEnv(rng=env_seed, **env_kwargs)
+    if args.resume is not None:
+        learner = read_header(args.resume)[0].get('learner', 'q_learning')
+        if learner != args.learner:
+            raise ValueError(f"O checkpoint foi treinado com {learner}; use --learner {learner}.")
+        agent = LEARNERS[learner].load(args.resume)
+        args.alpha, args.gamma = agent.alpha, agent.gamma
+        args.epsilon, args.epsilon_decay, args.epsilon_min = agent.epsilon, agent.epsilon_decay, agent.epsilon_min
+        args.stats_window = agent.stats.window
+    else:
+        for name, value in AGENT_DEFAULTS.items():
+            if getattr(args, name) is None:
+                setattr(args, name, value)
+        learner_kwargs = {'lam': args.lam} if args.lam is not None else {}
+        agent = make_agent(
+            args.learner,
+            num_states=env.num_states,
+            alpha=args.alpha,
+            gamma=args.gamma,
+            epsilon=args.epsilon,
+            epsilon_decay=args.epsilon_decay,
+            epsilon_min=args.epsilon_min,
+            stats_window=args.stats_window,
+            rng=agent_seed,
+            **learner_kwargs
+        )
+    if args.learner == 'q_lambda':
+        args.lam = agent.lam
+    if agent.num_states != env.num_states:
+        raise ValueError(f"O checkpoint tem {agent.num_states} estados, mas o ambiente tem {env.num_states}.")
+
+    writer = MetricsWriter(metrics_path, format='jsonl')
+    writer.write({'event': 'config', **vars(args)})
+    reporter = _Reporter(writer, agent.total_episodes, args.episodes, args.log_every, args.quiet)
+    profile = PhaseProfiler(sample_every=args.profile_every) if args.profile else None
+
+    if args.workers > 1:
+        trainer = ParallelTrainer(agent, num_workers=args.workers, sync_every=args.sync_every,
+                                  merge=args.merge, seed=seed, env_kwargs=env_kwargs)
+        trainer.train(args.episodes, verbose=False, callbacks=[reporter])
+    elif args.checkpoint_every:
+        agent.train(env, args.episodes, fast=args.fast, verbose=False, callbacks=[reporter],
+                    checkpoint_path=checkpoint_path, checkpoint_every=args.checkpoint_every, profile=profile)
+    else:
+        agent.train(env, args.episodes, fast=args.fast, verbose=False, callbacks=[reporter], profile=profile)
+
+    if not args.checkpoint_every or args.workers > 1:
+        agent.save(checkpoint_path)
+
+    record = {'event': 'end', **reporter.last, 'checkpoint': checkpoint_path}
+    reporter.emit(record)
+
+    if profile is not None:
+        profile.save(os.path.join(args.output, 'profile.json'))
+        if not args.quiet:
+            print(profile.format_report())
+
+    if not args.quiet:
+        print(f"Treinamento concluído em {record['elapsed']:.2f}s. Checkpoint salvo em {checkpoint_path}.")
+
+    return record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        run(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import math
+import numpy as np
+from typing import Optional
+
+
+STOP_REASONS = {
+    'q_star': 'Q dentro da tolerância de Q*',
+    'delta_q': 'variação máxima de Q abaixo da tolerância',
+    'policy': 'política gulosa estável',
+    'win_rate': 'taxa de vitória estável dentro do intervalo de confiança',
+}
+
+
+class ConvergenceMonitor:
+
+    def __init__(
+        self,
+        delta_q_tol: Optional[float] = None,
+        policy_patience: Optional[int] = None,
+        win_rate_tol: Optional[float] = None,
+        q_star: Optional[np.ndarray] = None,
+        q_tol: float = 0.05,
+        check_every: int = 1000,
+        z: float = 1.96
+    ):
+        if delta_q_tol is None and policy_patience is None and win_rate_tol is None and q_star is None:
+            raise ValueError("Defina ao menos um critério de parada.")
+
+        self.delta_q_tol = delta_q_tol
+        self.policy_patience = policy_patience
+        self.win_rate_tol = win_rate_tol
+        self.q_star = q_star
+        self.q_tol = q_tol
+        self.check_every = check_every
+        self.z = z
+
+        self.reset()
+
+    def reset(self):
+        self.reason = None
+        self.metrics = {}
+        self._prev_Q = None
+        self._prev_policy = None
+        self._prev_win_rate = None
+        self._stable_checks = 0
+
+    def check(self, agent) -> Optional[str]:
+        Q = agent.Q
+        policy = np.argmax(Q, axis=1)
+        metrics = {}
+        fired = []
+
+        if self.q_star is not None:
+            distance = float(np.max(np.abs(Q - self.q_star)))
+            metrics['q_star_distance'] = distance
+            if distance <= self.q_tol:
+                fired.append('q_star')
+
+        if self._prev_Q is not None:
+            delta = float(np.max(np.abs(Q - self._prev_Q)))
+            metrics['delta_q'] = delta
+            if self.delta_q_tol is not None and delta <= self.delta_q_tol:
+                fired.append('delta_q')
+
+            if np.array_equal(policy, self._prev_policy):
+                self._stable_checks += 1
+            else:
+                self._stable_checks = 0
+            metrics['policy_stable_checks'] = self._stable_checks
+            if self.policy_patience is not None and self._stable_checks >= self.policy_patience:
+                fired.append('policy')
+
+        n = len(agent.stats)
+        if n > 0:
+            win_rate = agent.stats.win_rate
+            half_width = self.z * math.sqrt(win_rate * (1 - win_rate) / n)
+            metrics['win_rate_ci'] = half_width
+            if (self.win_rate_tol is not None and self._prev_win_rate is not None
+                    and half_width <= self.win_rate_tol
+                    and abs(win_rate - self._prev_win_rate) <= half_width):
+                fired.append('win_rate')
+            self._prev_win_rate = win_rate
+
+        self._prev_Q = Q.copy()
+        self._prev_policy = policy
+        self.metrics = metrics
+
+        if fired:
+            self.reason = fired[0]
+        return self.reason
+
+    def describe(self) -> str:
+        parts = []
+        if 'q_star_distance' in self.metrics:
+            parts.append(f"Distância a Q*: {self.metrics['q_star_distance']:.4f}")
+        if 'delta_q' in self.metrics:
+            parts.append(f"ΔQ máx: {self.metrics['delta_q']:.4f}")
+        if 'policy_stable_checks' in self.metrics and self.policy_patience is not None:
+            parts.append(f"Política estável: {self.metrics['policy_stable_checks']}/{self.policy_patience}")
+        return " | ".join(parts)
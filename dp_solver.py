@@ -0,0 +1,104 @@
+import numpy as np
+from functools import lru_cache
+from typing import Tuple
+
+
+CARD_VALUES = np.arange(1, 11)
+CARD_PROBS = np.array([1 / 13] * 9 + [4 / 13])
+
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, 'bust')
+
+MIN_HAND = 2
+MAX_HAND = 21
+NUM_HANDS = MAX_HAND - MIN_HAND + 1
+
+
+@lru_cache(maxsize=None)
+def _dealer_final(start_total: int) -> Tuple[float, ...]:
+    if start_total > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if start_total >= 17:
+        dist = [0.0] * 6
+        dist[start_total - 17] = 1.0
+        return tuple(dist)
+
+    dist = np.zeros(6)
+    for card, prob in zip(CARD_VALUES.tolist(), CARD_PROBS.tolist()):
+        dist += prob * np.array(_dealer_final(start_total + card))
+    return tuple(dist.tolist())
+
+
+def dealer_final_distribution(start_total: int) -> np.ndarray:
+    return np.array(_dealer_final(start_total))
+
+
+def two_card_distribution() -> np.ndarray:
+    dist = np.zeros(MAX_HAND + 1)
+    for c1, p1 in zip(CARD_VALUES, CARD_PROBS):
+        for c2, p2 in zip(CARD_VALUES, CARD_PROBS):
+            dist[c1 + c2] += p1 * p2
+    return dist
+
+
+def dealer_outcome_distribution() -> np.ndarray:
+    start = two_card_distribution()
+    return sum(start[t] * dealer_final_distribution(t) for t in range(MIN_HAND, MAX_HAND + 1))
+
+
+def stand_reward(player_total: int, dealer_dist: np.ndarray = None) -> float:
+    if dealer_dist is None:
+        dealer_dist = dealer_outcome_distribution()
+
+    reward = dealer_dist[5]
+    for i, dealer_total in enumerate(DEALER_OUTCOMES[:5]):
+        reward += dealer_dist[i] * np.sign(player_total - dealer_total)
+    return float(reward)
+
+
+def build_model() -> Tuple[np.ndarray, np.ndarray]:
+    P = np.zeros((NUM_HANDS, 2, NUM_HANDS))
+    R = np.zeros((NUM_HANDS, 2))
+    dealer_dist = dealer_outcome_distribution()
+
+    for hand in range(MIN_HAND, MAX_HAND + 1):
+        h = hand - MIN_HAND
+        for card, prob in zip(CARD_VALUES, CARD_PROBS):
+            if hand + card > 21:
+                R[h, 0] -= prob
+            else:
+                P[h, 0, hand + card - MIN_HAND] += prob
+        R[h, 1] = stand_reward(hand, dealer_dist)
+
+    return P, R
+
+
+def value_iteration(P: np.ndarray, R: np.ndarray, gamma: float,
+                    tol: float = 1e-12, max_iter: int = 10000) -> np.ndarray:
+    Q = np.zeros_like(R)
+    for _ in range(max_iter):
+        new_Q = R + gamma * P @ Q.max(axis=1)
+        if np.max(np.abs(new_Q - Q)) < tol:
+            return new_Q
+        Q = new_Q
+    return Q
+
+
+def solve(gamma: float = 0.95, tol: float = 1e-12) -> np.ndarray:
+    P, R = build_model()
+    hand_Q = value_iteration(P, R, gamma, tol)
+
+    # O estado 0 agrupa as mãos 2, 3 e 4 (valores abaixo de 4 são truncados);
+    # usa-se a média ponderada pela probabilidade de cada uma na distribuição inicial.
+    start = two_card_distribution()[MIN_HAND:5]
+    Q_star = np.zeros((18, 2))
+    Q_star[0] = start @ hand_Q[:5 - MIN_HAND] / start.sum()
+    Q_star[1:] = hand_Q[5 - MIN_HAND:]
+    return Q_star
+
+
+def q_distance(Q: np.ndarray, Q_star: np.ndarray) -> float:
+    return float(np.max(np.abs(Q - Q_star)))
+
+
+def policy_agreement(Q: np.ndarray, Q_star: np.ndarray) -> float:
+    return float(np.mean(np.argmax(Q, axis=1) == np.argmax(Q_star, axis=1)))
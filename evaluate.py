@@ -0,0 +1,91 @@
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from rng import make_generator, spawn_seeds, SeedLike
+from vector_env import (VectorBlackjackEnv, RESULT_BUST, RESULT_DEALER_BUST,
+                        RESULT_DEALER_WINS, RESULT_PLAYER_WINS, RESULT_TIE)
+
+
+def play_greedy(policy: np.ndarray, n_hands: int, seed: SeedLike = None, batch_size: int = 1 << 20) -> np.ndarray:
+    policy = np.asarray(policy)
+    rng = make_generator(seed)
+    counts = np.zeros(RESULT_TIE + 1, dtype=np.int64)
+
+    env = None
+    remaining = n_hands
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        if env is None or env.num_envs != n:
+            env = VectorBlackjackEnv(num_envs=n, rng=rng, autoreset=False)
+        states = env.reset()
+
+        while not env.done.all():
+            states, rewards, dones, info = env.step(policy[states])
+            counts += np.bincount(info['result'][dones], minlength=len(counts))
+
+        remaining -= n
+
+    return counts
+
+
+def _summarize(counts: np.ndarray, z: float) -> dict:
+    n = int(counts.sum())
+    wins = int(counts[RESULT_PLAYER_WINS] + counts[RESULT_DEALER_BUST])
+    ties = int(counts[RESULT_TIE])
+    losses = int(counts[RESULT_DEALER_WINS] + counts[RESULT_BUST])
+    busts = int(counts[RESULT_BUST])
+
+    expected_return = (wins - losses) / n
+    second_moment = (wins + losses) / n
+    return_std = math.sqrt(max(0.0, second_moment - expected_return ** 2))
+
+    def rate(k: int):
+        p = k / n
+        return p, z * math.sqrt(p * (1 - p) / n)
+
+    result = {
+        'n_hands': n,
+        'expected_return': expected_return,
+        'expected_return_ci': z * return_std / math.sqrt(n),
+    }
+    for name, k in (('win_rate', wins), ('tie_rate', ties), ('loss_rate', losses), ('bust_rate', busts)):
+        result[name], result[name + '_ci'] = rate(k)
+    result['dealer_bust_rate'] = counts[RESULT_DEALER_BUST] / n
+    return result
+
+
+def evaluate(
+    agent,
+    n_hands: int = 1_000_000,
+    num_workers: int = 1,
+    seed: SeedLike = None,
+    batch_size: int = 1 << 20,
+    z: float = 1.96
+) -> dict:
+    policy = np.array(agent.get_policy())
+    if len(policy) != VectorBlackjackEnv.NUM_STATES:
+        raise ValueError(f"A avaliação vetorizada usa {VectorBlackjackEnv.NUM_STATES} estados; "
+                         f"a política tem {len(policy)}.")
+
+    if num_workers <= 1:
+        counts = play_greedy(policy, n_hands, seed, batch_size)
+    else:
+        seeds = spawn_seeds(seed, num_workers)
+        shares = [n_hands // num_workers + (1 if w < n_hands % num_workers else 0) for w in range(num_workers)]
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            futures = [pool.submit(play_greedy, policy, share, s, batch_size)
+                       for share, s in zip(shares, seeds) if share > 0]
+            counts = sum(future.result() for future in futures)
+
+    return _summarize(counts, z)
+
+
+def format_report(result: dict) -> str:
+    lines = [
+        f"Mãos avaliadas: {result['n_hands']:,}",
+        f"Retorno esperado: {result['expected_return']:+.4f} ± {result['expected_return_ci']:.4f}",
+    ]
+    for name, label in (('win_rate', 'Vitórias'), ('tie_rate', 'Empates'),
+                        ('loss_rate', 'Derrotas'), ('bust_rate', 'Estouros')):
+        lines.append(f"{label}: {result[name] * 100:.2f}% ± {result[name + '_ci'] * 100:.2f}%")
+    return "\n".join(lines)
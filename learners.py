@@ -0,0 +1,463 @@
+import random
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from blackjack_env import Action
+from q_learning import QLearningAgent, average_update
+
+
+class SarsaAgent(QLearningAgent):
+
+    name = 'sarsa'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = None
+
+    def reset(self):
+        super().reset()
+        self._pending = None
+
+    def get_action(self, state: int, training: bool = True) -> Action:
+        # A ação do próximo estado já foi sorteada em update(); é ela que será executada
+        if training and self._pending is not None and self._pending[0] == state:
+            action = self._pending[1]
+            self._pending = None
+            return action
+        return super().get_action(state, training)
+
+    def update(self, state: int, action: Action, reward: float, next_state: int, done: bool):
+        action_idx = action.value
+        current_q = self.Q[state, action_idx]
+
+        if done:
+            self._pending = None
+            target_q = reward
+        else:
+            next_action = super().get_action(next_state, training=True)
+            self._pending = (next_state, next_action)
+            target_q = reward + self.gamma * self.Q[next_state, next_action.value]
+
+        self.Q[state, action_idx] = current_q + self.alpha * (target_q - current_q)
+
+    def update_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+        mode: str = 'sequential',
+        next_actions: Optional[np.ndarray] = None
+    ):
+        if next_actions is None:
+            raise ValueError("SARSA precisa de next_actions no update em lote.")
+
+        states = np.asarray(states, dtype=np.intp)
+        actions = np.asarray(actions, dtype=np.intp)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        next_states = np.asarray(next_states, dtype=np.intp)
+        next_actions = np.asarray(next_actions, dtype=np.intp)
+        dones = np.asarray(dones, dtype=bool)
+
+        if mode == 'sequential':
+            q = self.Q.tolist()
+            alpha = self.alpha
+            gamma = self.gamma
+            for s, a, r, s2, a2, d in zip(states.tolist(), actions.tolist(), rewards.tolist(),
+                                          next_states.tolist(), next_actions.tolist(), dones.tolist()):
+                row = q[s]
+                target_q = r if d else r + gamma * q[s2][a2]
+                row[a] += alpha * (target_q - row[a])
+            self.Q[:] = q
+        elif mode == 'average':
+            next_q = self.Q[next_states, next_actions]
+            targets = np.where(dones, rewards, rewards + self.gamma * next_q)
+            self.Q += average_update(self.Q, self.alpha, states, actions, targets)
+        else:
+            raise ValueError(f"Modo de atualização desconhecido: {mode!r}. Use 'sequential' ou 'average'.")
+
+    def _fast_hooks(self, q: List[List[float]], actions: Tuple[int, ...], rand, random_index):
+        alpha = self.alpha
+        gamma = self.gamma
+
+        def learn(state, action, reward, next_state, done, epsilon):
+            row = q[state]
+            if done:
+                next_action = None
+                target_q = reward
+            else:
+                if rand() < epsilon:
+                    next_action = actions[random_index()]
+                else:
+                    next_row = q[next_state]
+                    next_action = next_row.index(max(next_row))
+                target_q = reward + gamma * q[next_state][next_action]
+            row[action] += alpha * (target_q - row[action])
+            return next_action
+
+        return learn, None, None
+
+
+class ExpectedSarsaAgent(QLearningAgent):
+
+    name = 'expected_sarsa'
+
+    def _expected_q(self, next_state: int) -> float:
+        row = self.Q[next_state]
+        return self.epsilon * row.mean() + (1.0 - self.epsilon) * row.max()
+
+    def update(self, state: int, action: Action, reward: float, next_state: int, done: bool):
+        action_idx = action.value
+        current_q = self.Q[state, action_idx]
+        target_q = reward if done else reward + self.gamma * self._expected_q(next_state)
+        self.Q[state, action_idx] = current_q + self.alpha * (target_q - current_q)
+
+    def _update_batch_sequential(self, states, actions, rewards, next_states, dones):
+        q = self.Q.tolist()
+        alpha = self.alpha
+        gamma = self.gamma
+        explore = self.epsilon / self.num_actions
+        exploit = 1.0 - self.epsilon
+
+        for s, a, r, s2, d in zip(states.tolist(), actions.tolist(), rewards.tolist(),
+                                  next_states.tolist(), dones.tolist()):
+            row = q[s]
+            if d:
+                target_q = r
+            else:
+                next_row = q[s2]
+                target_q = r + gamma * (explore * sum(next_row) + exploit * max(next_row))
+            row[a] += alpha * (target_q - row[a])
+
+        self.Q[:] = q
+
+    def _update_batch_average(self, states, actions, rewards, next_states, dones):
+        next_rows = self.Q[next_states]
+        expected = self.epsilon * next_rows.mean(axis=1) + (1.0 - self.epsilon) * next_rows.max(axis=1)
+        targets = np.where(dones, rewards, rewards + self.gamma * expected)
+        self.Q += average_update(self.Q, self.alpha, states, actions, targets)
+
+    def _fast_hooks(self, q: List[List[float]], actions: Tuple[int, ...], rand, random_index):
+        alpha = self.alpha
+        gamma = self.gamma
+        num_actions = len(actions)
+
+        def learn(state, action, reward, next_state, done, epsilon):
+            row = q[state]
+            if done:
+                target_q = reward
+            else:
+                next_row = q[next_state]
+                expected_q = epsilon / num_actions * sum(next_row) + (1.0 - epsilon) * max(next_row)
+                target_q = reward + gamma * expected_q
+            row[action] += alpha * (target_q - row[action])
+
+        return learn, None, None
+
+
+class DoubleQAgent(QLearningAgent):
+
+    name = 'double_q'
+
+    # Q guarda a média (Q_A + Q_B) / 2, usada para agir, avaliar e salvar;
+    # D guarda a meia-diferença, de modo que Q_A = Q + D e Q_B = Q - D
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.D = np.zeros_like(self.Q)
+
+    def reset(self):
+        super().reset()
+        self.D = np.zeros_like(self.Q)
+
+    @property
+    def Q_a(self) -> np.ndarray:
+        return self.Q + self.D
+
+    @property
+    def Q_b(self) -> np.ndarray:
+        return self.Q - self.D
+
+    def _checkpoint_arrays(self) -> Dict[str, np.ndarray]:
+        return {'D': self.D}
+
+    def _restore_arrays(self, arrays: Dict[str, np.ndarray]):
+        if 'D' in arrays:
+            self.D = arrays['D']
+
+    def _coin(self) -> float:
+        return random.random() if self.random is None else self.random.random()
+
+    def update(self, state: int, action: Action, reward: float, next_state: int, done: bool):
+        action_idx = action.value
+        sign = 1.0 if self._coin() < 0.5 else -1.0
+
+        current_q = self.Q[state, action_idx] + sign * self.D[state, action_idx]
+        if done:
+            target_q = reward
+        else:
+            own = self.Q[next_state] + sign * self.D[next_state]
+            best = int(np.argmax(own))
+            target_q = reward + self.gamma * (self.Q[next_state, best] - sign * self.D[next_state, best])
+
+        delta = 0.5 * self.alpha * (target_q - current_q)
+        self.Q[state, action_idx] += delta
+        self.D[state, action_idx] += sign * delta
+
+    def _update_batch_sequential(self, states, actions, rewards, next_states, dones):
+        q = self.Q.tolist()
+        diff = self.D.tolist()
+        alpha = self.alpha
+        gamma = self.gamma
+        coin = self._coin
+
+        for s, a, r, s2, d in zip(states.tolist(), actions.tolist(), rewards.tolist(),
+                                  next_states.tolist(), dones.tolist()):
+            sign = 1.0 if coin() < 0.5 else -1.0
+            if d:
+                target_q = r
+            else:
+                q2 = q[s2]
+                d2 = diff[s2]
+                own = [x + sign * y for x, y in zip(q2, d2)]
+                best = own.index(max(own))
+                target_q = r + gamma * (q2[best] - sign * d2[best])
+            delta = 0.5 * alpha * (target_q - (q[s][a] + sign * diff[s][a]))
+            q[s][a] += delta
+            diff[s][a] += sign * delta
+
+        self.Q[:] = q
+        self.D[:] = diff
+
+    def _update_batch_average(self, states, actions, rewards, next_states, dones):
+        coin = self._coin
+        signs = np.where(np.array([coin() for _ in range(len(states))]) < 0.5, 1.0, -1.0)
+
+        for sign in (1.0, -1.0):
+            mask = signs == sign
+            if not mask.any():
+                continue
+            s, a, r, s2, d = states[mask], actions[mask], rewards[mask], next_states[mask], dones[mask]
+            own = self.Q + sign * self.D
+            other = self.Q - sign * self.D
+            best = own[s2].argmax(axis=1)
+            targets = np.where(d, r, r + self.gamma * other[s2, best])
+            delta = 0.5 * average_update(own, self.alpha, s, a, targets)
+            self.Q += delta
+            self.D += sign * delta
+
+    def _fast_hooks(self, q: List[List[float]], actions: Tuple[int, ...], rand, random_index):
+        diff = self.D.tolist()
+        half_alpha = 0.5 * self.alpha
+        gamma = self.gamma
+
+        def learn(state, action, reward, next_state, done, epsilon):
+            sign = 1.0 if rand() < 0.5 else -1.0
+            if done:
+                target_q = reward
+            else:
+                q2 = q[next_state]
+                d2 = diff[next_state]
+                own = [x + sign * y for x, y in zip(q2, d2)]
+                best = own.index(max(own))
+                target_q = reward + gamma * (q2[best] - sign * d2[best])
+            row = q[state]
+            diff_row = diff[state]
+            delta = half_alpha * (target_q - (row[action] + sign * diff_row[action]))
+            row[action] += delta
+            diff_row[action] += sign * delta
+
+        def end_run():
+            self.D[:] = diff
+
+        return learn, None, end_run
+
+
+class MonteCarloAgent(QLearningAgent):
+
+    name = 'monte_carlo'
+
+    # Monte Carlo de toda-visita com alpha constante: atualiza Q pelo retorno ao fim do episódio
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._episode = []
+
+    def reset(self):
+        super().reset()
+        self._episode = []
+
+    def update(self, state: int, action: Action, reward: float, next_state: int, done: bool):
+        self._episode.append((state, action.value, reward))
+        if not done:
+            return
+
+        G = 0.0
+        for s, a, r in reversed(self._episode):
+            G = r + self.gamma * G
+            self.Q[s, a] += self.alpha * (G - self.Q[s, a])
+        self._episode = []
+
+    def _returns(self, rewards: np.ndarray, dones: np.ndarray) -> List[float]:
+        if len(dones) and not dones[-1]:
+            raise ValueError("O lote do Monte Carlo deve terminar no fim de um episódio.")
+
+        returns = [0.0] * len(rewards)
+        G = 0.0
+        gamma = self.gamma
+        for i, (r, d) in enumerate(zip(reversed(rewards.tolist()), reversed(dones.tolist()))):
+            G = r if d else r + gamma * G
+            returns[-1 - i] = G
+        return returns
+
+    def _update_batch_sequential(self, states, actions, rewards, next_states, dones):
+        q = self.Q.tolist()
+        alpha = self.alpha
+
+        for s, a, G in zip(states.tolist(), actions.tolist(), self._returns(rewards, dones)):
+            row = q[s]
+            row[a] += alpha * (G - row[a])
+
+        self.Q[:] = q
+
+    def _update_batch_average(self, states, actions, rewards, next_states, dones):
+        targets = np.array(self._returns(rewards, dones))
+        self.Q += average_update(self.Q, self.alpha, states, actions, targets)
+
+    def _fast_hooks(self, q: List[List[float]], actions: Tuple[int, ...], rand, random_index):
+        alpha = self.alpha
+        gamma = self.gamma
+        trajectory = []
+
+        def learn(state, action, reward, next_state, done, epsilon):
+            trajectory.append((state, action, reward))
+
+        def end_episode():
+            G = 0.0
+            for s, a, r in reversed(trajectory):
+                G = r + gamma * G
+                row = q[s]
+                row[a] += alpha * (G - row[a])
+            trajectory.clear()
+
+        return learn, end_episode, None
+
+
+class QLambdaAgent(QLearningAgent):
+
+    name = 'q_lambda'
+
+    # Watkins Q(lambda) offline: os erros TD do episódio são calculados com a Q do início
+    # e distribuídos numa única varredura reversa pelos pares visitados (traço esparso)
+    def __init__(self, *args, lam: float = 0.5, **kwargs):
+        if not 0.0 <= lam <= 1.0:
+            raise ValueError("lam deve estar em [0, 1].")
+        super().__init__(*args, **kwargs)
+        self.lam = lam
+        self._episode = []
+
+    def learner_params(self) -> dict:
+        return {'lam': self.lam}
+
+    def reset(self):
+        super().reset()
+        self._episode = []
+
+    def update(self, state: int, action: Action, reward: float, next_state: int, done: bool):
+        action_idx = action.value
+        current_q = self.Q[state, action_idx]
+        target_q = reward if done else reward + self.gamma * np.max(self.Q[next_state])
+        greedy = current_q == np.max(self.Q[state])
+        self._episode.append((state, action_idx, target_q - current_q, greedy))
+        if not done:
+            return
+
+        q = self.Q
+        decay = self.gamma * self.lam
+        acc = 0.0
+        for s, a, delta, greedy in reversed(self._episode):
+            acc = delta + decay * acc
+            q[s, a] += self.alpha * acc
+            if not greedy:
+                acc = 0.0
+        self._episode = []
+
+    def _returns(self, states, actions, rewards, next_states, dones) -> np.ndarray:
+        if len(dones) and not dones[-1]:
+            raise ValueError("O lote do Q(lambda) deve terminar no fim de um episódio.")
+
+        current = self.Q[states, actions]
+        targets = np.where(dones, rewards, rewards + self.gamma * self.Q[next_states].max(axis=1))
+        deltas = (targets - current).tolist()
+        greedy = (current == self.Q[states].max(axis=1)).tolist()
+
+        decay = self.gamma * self.lam
+        acc_deltas = [0.0] * len(deltas)
+        acc = 0.0
+        for i in range(len(deltas) - 1, -1, -1):
+            if dones[i]:
+                acc = 0.0
+            acc = deltas[i] + decay * acc
+            acc_deltas[i] = acc
+            if not greedy[i]:
+                acc = 0.0
+        return np.array(acc_deltas)
+
+    def _update_batch_sequential(self, states, actions, rewards, next_states, dones):
+        if len(dones) and not dones[-1]:
+            raise ValueError("O lote do Q(lambda) deve terminar no fim de um episódio.")
+
+        # Cada episódio usa a Q já atualizada pelos anteriores, como em chamadas de update()
+        start = 0
+        for end in (np.flatnonzero(dones) + 1).tolist():
+            episode = slice(start, end)
+            acc_deltas = self._returns(states[episode], actions[episode], rewards[episode],
+                                       next_states[episode], dones[episode])
+            np.add.at(self.Q, (states[episode], actions[episode]), self.alpha * acc_deltas)
+            start = end
+
+    def _update_batch_average(self, states, actions, rewards, next_states, dones):
+        acc_deltas = self._returns(states, actions, rewards, next_states, dones)
+        targets = self.Q[states, actions] + acc_deltas
+        self.Q += average_update(self.Q, self.alpha, states, actions, targets)
+
+    def _fast_hooks(self, q: List[List[float]], actions: Tuple[int, ...], rand, random_index):
+        alpha = self.alpha
+        gamma = self.gamma
+        decay = self.gamma * self.lam
+        trace = []
+
+        # Q só muda no fim do episódio, então max(row) ainda é o valor visto ao escolher a ação
+        def learn(state, action, reward, next_state, done, epsilon):
+            row = q[state]
+            current_q = row[action]
+            if done:
+                delta = reward - current_q
+            else:
+                delta = reward + gamma * max(q[next_state]) - current_q
+            trace.append((row, action, delta, current_q == max(row)))
+
+        def end_episode():
+            acc = 0.0
+            for row, action, delta, greedy in reversed(trace):
+                acc = delta + decay * acc
+                row[action] += alpha * acc
+                if not greedy:
+                    acc = 0.0
+            trace.clear()
+
+        return learn, end_episode, None
+
+
+LEARNERS = {
+    QLearningAgent.name: QLearningAgent,
+    SarsaAgent.name: SarsaAgent,
+    ExpectedSarsaAgent.name: ExpectedSarsaAgent,
+    DoubleQAgent.name: DoubleQAgent,
+    MonteCarloAgent.name: MonteCarloAgent,
+    QLambdaAgent.name: QLambdaAgent,
+}
+
+
+def make_agent(learner: str = 'q_learning', **kwargs) -> QLearningAgent:
+    if learner not in LEARNERS:
+        raise ValueError(f"Algoritmo desconhecido: {learner!r}. Use um de {tuple(LEARNERS)}.")
+    return LEARNERS[learner](**kwargs)
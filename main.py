@@ -1,17 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import sys
 import threading
-import numpy as np
 import matplotlib
 matplotlib.use('TkAgg')
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from blackjack_env import BlackjackEnv, Action
+from blackjack_env import BlackjackEnv, Action, NUM_PLAYER_TOTALS, project_q
 from q_learning import QLearningAgent
+from convergence import ConvergenceMonitor
+from plots import HeatmapRenderer, LearningCurvesRenderer
+from snapshot import TrainingHistory, TrainingSnapshot, SnapshotChannel, completion_message
+from training_process import TrainingProcess
+from profiler import PhaseProfiler
 
 
 class ModernQLearningGUI:    
-    def __init__(self, root):
+    FPS = 30
+    HISTORY_EVERY = 100
+    
+    def __init__(self, root, use_process: bool = False, profile: bool = False, extended_state: bool = False):
         self.root = root
         self.root.title("🎰 Q-Learning Blackjack - Visualização Interativa")
         self.root.geometry("1400x900")
@@ -21,26 +29,35 @@ class ModernQLearningGUI:
         style.theme_use('clam')
         self._configure_styles()
         
-        self.env = BlackjackEnv()
-        self.agent = QLearningAgent(
+        env_kwargs = dict(extended_state=extended_state)
+        self.env = BlackjackEnv(**env_kwargs)
+        agent_kwargs = dict(
+            num_states=self.env.num_states,
             alpha=0.1,
             gamma=0.95,
             epsilon=1.0,
             epsilon_decay=0.995,
             epsilon_min=0.01
         )
+        self.agent = QLearningAgent(**agent_kwargs)
         
         self.training = False
         self.training_thread = None
         
-        self.reward_history = []
-        self.win_rate_history = []
-        self.epsilon_history = []
-        self.episode_numbers = []
+        self.history = TrainingHistory()
+        self.profile = PhaseProfiler() if profile else None
+        if use_process:
+            self.trainer = TrainingProcess(agent_kwargs, env_kwargs, min_interval=1.0 / self.FPS)
+            self.channel = self.trainer
+        else:
+            self.trainer = None
+            self.channel = SnapshotChannel(min_interval=1.0 / self.FPS)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         self._create_widgets()
         
         self.update_all_visualizations()
+        self._poll_snapshots()
         
     def _configure_styles(self):
         style = ttk.Style()
@@ -177,6 +194,20 @@ class ModernQLearningGUI:
         )
         self.reset_button.grid(row=0, column=3, padx=5)
         
+        self.stop_on_convergence = tk.BooleanVar(value=False)
+        self.convergence_check = tk.Checkbutton(
+            button_frame,
+            text="Parar ao convergir",
+            variable=self.stop_on_convergence,
+            font=('Segoe UI', 9),
+            bg='#16213e',
+            fg='#ffffff',
+            selectcolor='#0f3460',
+            activebackground='#16213e',
+            activeforeground='#00d4ff'
+        )
+        self.convergence_check.grid(row=1, column=0, columnspan=4, pady=(8, 0))
+        
         stats_frame = tk.Frame(top_frame, bg='#16213e')
         stats_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         
@@ -266,6 +297,7 @@ class ModernQLearningGUI:
         self.heatmap_fig = Figure(figsize=(12, 6), facecolor='#1a1a2e')
         self.heatmap_canvas = FigureCanvasTkAgg(self.heatmap_fig, heatmap_container)
         self.heatmap_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.heatmap = HeatmapRenderer(self.heatmap_fig, NUM_PLAYER_TOTALS)
         
         toolbar_frame = tk.Frame(heatmap_container, bg='#1a1a2e')
         toolbar_frame.pack(fill=tk.X)
@@ -285,6 +317,7 @@ class ModernQLearningGUI:
         
         self.graphs_canvas = FigureCanvasTkAgg(self.graphs_fig, graphs_container)
         self.graphs_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.graphs = LearningCurvesRenderer(self.graphs_fig, NUM_PLAYER_TOTALS)
         
     def _create_table_tab(self):
         table_frame = tk.Frame(self.notebook, bg='#1a1a2e')
@@ -307,138 +340,17 @@ class ModernQLearningGUI:
         
         self.table_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self._build_table()
     
-    def update_heatmap(self):
-        self.heatmap_fig.clear()
-        ax = self.heatmap_fig.add_subplot(111)
-        ax.set_facecolor('#1a1a2e')
-        
-        Q_matrix = self.agent.Q
-        states = [f'{i+4}' for i in range(self.agent.num_states)]
-        actions = ['HIT', 'STAND']
-        
-        im = ax.imshow(Q_matrix.T, cmap='RdYlGn', aspect='auto', interpolation='nearest')
-        
-        ax.set_xticks(range(len(states)))
-        ax.set_xticklabels(states, color='white', fontsize=8)
-        ax.set_yticks(range(len(actions)))
-        ax.set_yticklabels(actions, color='white', fontsize=10, fontweight='bold')
-        ax.set_xlabel('Valor da Mão (Estado)', color='white', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Ação', color='white', fontsize=12, fontweight='bold')
-        ax.set_title('🔥 Matriz Q - Heatmap Interativo', 
-                    color='#00d4ff', fontsize=14, fontweight='bold', pad=15)
-        
-        for i in range(len(actions)):
-            for j in range(len(states)):
-                text = ax.text(j, i, f'{Q_matrix[j, i]:.2f}',
-                             ha="center", va="center", color="black", fontsize=7, fontweight='bold')
-        
-        cbar = self.heatmap_fig.colorbar(im, ax=ax)
-        cbar.ax.set_ylabel('Valor Q', color='white', fontsize=10)
-        cbar.ax.tick_params(colors='white')
-        
-        for spine in ax.spines.values():
-            spine.set_color('white')
-        
-        ax.tick_params(colors='white')
-        self.heatmap_fig.patch.set_facecolor('#1a1a2e')
-        self.heatmap_canvas.draw()
+    def update_heatmap(self, snapshot: TrainingSnapshot):
+        self.heatmap.update(project_q(snapshot.Q))
     
-    def update_graphs(self):
-        self.graphs_fig.clear()
-        
-        if len(self.episode_numbers) == 0:
-            ax = self.graphs_fig.add_subplot(111)
-            ax.set_facecolor('#1a1a2e')
-            ax.text(0.5, 0.5, 'Inicie o treinamento para ver os gráficos',
-                   ha='center', va='center', color='white', fontsize=14,
-                   transform=ax.transAxes)
-            ax.set_xticks([])
-            ax.set_yticks([])
-            for spine in ax.spines.values():
-                spine.set_color('#1a1a2e')
-        else:
-            ax1 = self.graphs_fig.add_subplot(221)
-            ax1.set_facecolor('#1a1a2e')
-            ax1.plot(self.episode_numbers, self.reward_history, 
-                    color='#00ff88', linewidth=2, label='Recompensa Média')
-            ax1.fill_between(self.episode_numbers, self.reward_history, 
-                           alpha=0.3, color='#00ff88')
-            ax1.set_xlabel('Episódio', color='white', fontweight='bold')
-            ax1.set_ylabel('Recompensa', color='white', fontweight='bold')
-            ax1.set_title('💰 Recompensa ao Longo do Tempo', 
-                         color='#00ff88', fontweight='bold', pad=10)
-            ax1.tick_params(colors='white')
-            ax1.grid(True, alpha=0.3, color='white')
-            ax1.legend(loc='best', facecolor='#16213e', edgecolor='white', labelcolor='white')
-            for spine in ax1.spines.values():
-                spine.set_color('white')
-            
-            ax2 = self.graphs_fig.add_subplot(222)
-            ax2.set_facecolor('#1a1a2e')
-            ax2.plot(self.episode_numbers, self.win_rate_history, 
-                    color='#00d4ff', linewidth=2, label='Taxa de Vitória')
-            ax2.fill_between(self.episode_numbers, self.win_rate_history, 
-                           alpha=0.3, color='#00d4ff')
-            ax2.set_xlabel('Episódio', color='white', fontweight='bold')
-            ax2.set_ylabel('Taxa (%)', color='white', fontweight='bold')
-            ax2.set_title('🏆 Taxa de Vitória', 
-                         color='#00d4ff', fontweight='bold', pad=10)
-            ax2.set_ylim([0, 1])
-            ax2.tick_params(colors='white')
-            ax2.grid(True, alpha=0.3, color='white')
-            ax2.legend(loc='best', facecolor='#16213e', edgecolor='white', labelcolor='white')
-            for spine in ax2.spines.values():
-                spine.set_color('white')
-            
-            ax3 = self.graphs_fig.add_subplot(223)
-            ax3.set_facecolor('#1a1a2e')
-            ax3.plot(self.episode_numbers, self.epsilon_history, 
-                    color='#ffaa00', linewidth=2, label='Epsilon')
-            ax3.set_xlabel('Episódio', color='white', fontweight='bold')
-            ax3.set_ylabel('Epsilon', color='white', fontweight='bold')
-            ax3.set_title('🎯 Decaimento do Epsilon (Exploração)', 
-                         color='#ffaa00', fontweight='bold', pad=10)
-            ax3.tick_params(colors='white')
-            ax3.grid(True, alpha=0.3, color='white')
-            ax3.legend(loc='best', facecolor='#16213e', edgecolor='white', labelcolor='white')
-            for spine in ax3.spines.values():
-                spine.set_color('white')
-            
-            ax4 = self.graphs_fig.add_subplot(224)
-            ax4.set_facecolor('#1a1a2e')
-            
-            states_range = range(self.agent.num_states)
-            hit_values = [self.agent.Q[s, Action.HIT.value] for s in states_range]
-            stand_values = [self.agent.Q[s, Action.STAND.value] for s in states_range]
-            
-            x = [s + 4 for s in states_range]
-            width = 0.35
-            x_pos = np.arange(len(x))
-            
-            ax4.bar(x_pos - width/2, hit_values, width, label='HIT', 
-                   color='#00d4ff', alpha=0.8)
-            ax4.bar(x_pos + width/2, stand_values, width, label='STAND', 
-                   color='#00ff88', alpha=0.8)
-            ax4.set_xlabel('Valor da Mão', color='white', fontweight='bold')
-            ax4.set_ylabel('Valor Q', color='white', fontweight='bold')
-            ax4.set_title('⚔️ Comparação HIT vs STAND por Estado', 
-                         color='white', fontweight='bold', pad=10)
-            ax4.set_xticks(x_pos[::3])
-            ax4.set_xticklabels(x[::3], color='white')
-            ax4.tick_params(colors='white')
-            ax4.grid(True, alpha=0.3, color='white', axis='y')
-            ax4.legend(loc='best', facecolor='#16213e', edgecolor='white', labelcolor='white')
-            for spine in ax4.spines.values():
-                spine.set_color('white')
-        
-        self.graphs_fig.patch.set_facecolor('#1a1a2e')
-        self.graphs_canvas.draw()
+    def update_graphs(self, snapshot: TrainingSnapshot):
+        episodes, rewards, win_rates, epsilons = snapshot.history
+        self.graphs.update(episodes, rewards, win_rates, epsilons, project_q(snapshot.Q))
     
-    def update_table(self):
-        for widget in self.table_scrollable_frame.winfo_children():
-            widget.destroy()
-        
+    def _build_table(self):
         header_frame = tk.Frame(self.table_scrollable_frame, bg='#0f3460')
         header_frame.pack(fill=tk.X, pady=(0, 5))
         
@@ -460,13 +372,9 @@ class ModernQLearningGUI:
             label.grid(row=0, column=i, sticky='ew')
             header_frame.columnconfigure(i, weight=1)
         
-        for state in range(self.agent.num_states):
-            hand_value = state + 4
-            hit_q = self.agent.Q[state, Action.HIT.value]
-            stand_q = self.agent.Q[state, Action.STAND.value]
-            best_action_idx = np.argmax(self.agent.Q[state, :])
-            best_action = "HIT" if best_action_idx == Action.HIT.value else "STAND"
-            
+        self.table_cells = []
+        self.table_cache = []
+        for state in range(NUM_PLAYER_TOTALS):
             bg_color = '#16213e' if state % 2 == 0 else '#1a1a2e'
             
             row_frame = tk.Frame(self.table_scrollable_frame, bg=bg_color)
@@ -475,25 +383,53 @@ class ModernQLearningGUI:
             tk.Label(row_frame, text=str(state), font=('Segoe UI', 9),
                     bg=bg_color, fg='white', width=8, anchor='w', padx=10).grid(row=0, column=0, sticky='ew')
             
-            tk.Label(row_frame, text=str(hand_value), font=('Segoe UI', 9, 'bold'),
+            tk.Label(row_frame, text=str(state + 4), font=('Segoe UI', 9, 'bold'),
                     bg=bg_color, fg='#00ff88', width=8, anchor='w', padx=10).grid(row=0, column=1, sticky='ew')
             
-            hit_color = self._get_gradient_color(hit_q, Action.HIT.value)
-            tk.Label(row_frame, text=f"{hit_q:.3f}", font=('Segoe UI', 9, 'bold'),
-                    bg=hit_color, fg='#000000' if hit_q > 0 else '#ffffff',
-                    width=15, anchor='w', padx=10).grid(row=0, column=2, sticky='ew')
+            hit_label = tk.Label(row_frame, font=('Segoe UI', 9, 'bold'), width=15, anchor='w', padx=10)
+            hit_label.grid(row=0, column=2, sticky='ew')
             
-            stand_color = self._get_gradient_color(stand_q, Action.STAND.value)
-            tk.Label(row_frame, text=f"{stand_q:.3f}", font=('Segoe UI', 9, 'bold'),
-                    bg=stand_color, fg='#000000' if stand_q > 0 else '#ffffff',
-                    width=15, anchor='w', padx=10).grid(row=0, column=3, sticky='ew')
+            stand_label = tk.Label(row_frame, font=('Segoe UI', 9, 'bold'), width=15, anchor='w', padx=10)
+            stand_label.grid(row=0, column=3, sticky='ew')
             
-            action_color = '#00d4ff' if best_action == 'HIT' else '#00ff88'
-            tk.Label(row_frame, text=best_action, font=('Segoe UI', 9, 'bold'),
-                    bg=bg_color, fg=action_color, width=12, anchor='w', padx=10).grid(row=0, column=4, sticky='ew')
+            action_label = tk.Label(row_frame, font=('Segoe UI', 9, 'bold'), bg=bg_color,
+                                    width=12, anchor='w', padx=10)
+            action_label.grid(row=0, column=4, sticky='ew')
             
             for i in range(5):
                 row_frame.columnconfigure(i, weight=1)
+            
+            self.table_cells.append((hit_label, stand_label, action_label))
+            self.table_cache.append((None, None, None))
+    
+    def _table_cell(self, q_value: float, action: int) -> tuple:
+        return (f"{q_value:.3f}", self._get_gradient_color(q_value, action),
+                '#000000' if q_value > 0 else '#ffffff')
+    
+    def update_table(self, snapshot: TrainingSnapshot):
+        for state, (hit_q, stand_q) in enumerate(project_q(snapshot.Q).tolist()):
+            best_action = "HIT" if hit_q >= stand_q else "STAND"
+            row = (
+                self._table_cell(hit_q, Action.HIT.value),
+                self._table_cell(stand_q, Action.STAND.value),
+                (best_action, '#00d4ff' if best_action == 'HIT' else '#00ff88'),
+            )
+            
+            cached = self.table_cache[state]
+            if row == cached:
+                continue
+            
+            hit_label, stand_label, action_label = self.table_cells[state]
+            if row[0] != cached[0]:
+                text, bg, fg = row[0]
+                hit_label.configure(text=text, bg=bg, fg=fg)
+            if row[1] != cached[1]:
+                text, bg, fg = row[1]
+                stand_label.configure(text=text, bg=bg, fg=fg)
+            if row[2] != cached[2]:
+                text, fg = row[2]
+                action_label.configure(text=text, fg=fg)
+            self.table_cache[state] = row
     
     def _get_gradient_color(self, q_value: float, action: int) -> str:
         normalized = (q_value + 2) / 4.0
@@ -510,31 +446,35 @@ class ModernQLearningGUI:
             b = int(100 + normalized * 100)
             return f"#{r:02x}{g:02x}{b:02x}"
     
-    def update_stats(self):
-        stats = self.agent.get_stats()
+    def update_stats(self, snapshot: TrainingSnapshot):
+        stats = snapshot.stats
         if stats:
             self.stats_labels['episodes'].config(text=str(stats['total_episodes']))
             self.stats_labels['avg_reward'].config(text=f"{stats['avg_reward_recent']:.3f}")
             self.stats_labels['win_rate'].config(text=f"{stats['win_rate']*100:.1f}%")
             self.stats_labels['epsilon'].config(text=f"{stats['epsilon']:.3f}")
-            
-            if stats['total_episodes'] % 100 == 0:
-                self.episode_numbers.append(stats['total_episodes'])
-                self.reward_history.append(stats['avg_reward_recent'])
-                self.win_rate_history.append(stats['win_rate'])
-                self.epsilon_history.append(stats['epsilon'])
-                
-                if len(self.episode_numbers) > 1000:
-                    self.episode_numbers.pop(0)
-                    self.reward_history.pop(0)
-                    self.win_rate_history.pop(0)
-                    self.epsilon_history.pop(0)
     
-    def update_all_visualizations(self):
-        self.update_heatmap()
-        self.update_graphs()
-        self.update_table()
-        self.update_stats()
+    def update_all_visualizations(self, snapshot: TrainingSnapshot = None):
+        if snapshot is None:
+            snapshot = TrainingSnapshot.capture(self.agent, self.history)
+        self.update_heatmap(snapshot)
+        self.update_graphs(snapshot)
+        self.update_table(snapshot)
+        self.update_stats(snapshot)
+    
+    def _poll_snapshots(self):
+        snapshot = self.channel.poll()
+        if snapshot is not None:
+            self.update_all_visualizations(snapshot)
+            if snapshot.finished:
+                self.root.title("🎰 Q-Learning Blackjack - Visualização Interativa")
+                self.stop_training()
+                messagebox.showinfo("Treinamento Completo", snapshot.message)
+            elif snapshot.num_episodes:
+                self.root.title(f"🎰 Q-Learning Blackjack - Visualização Interativa "
+                                f"(Treinando... {snapshot.progress:.1f}%)")
+        
+        self.root.after(int(1000 / self.FPS), self._poll_snapshots)
     
     def train_1000(self):
         if self.training:
@@ -542,12 +482,22 @@ class ModernQLearningGUI:
                                  "Aguarde o treinamento atual terminar.")
             return
         
+        self._start_training(1000)
+    
+    def _start_training(self, num_episodes: int):
         self.training = True
         self.train_button.config(state=tk.DISABLED)
         self.train_custom_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         
-        self.training_thread = threading.Thread(target=self._train, args=(1000,), daemon=True)
+        monitor_kwargs = dict(policy_patience=5, check_every=500) if self.stop_on_convergence.get() else None
+        
+        if self.trainer is not None:
+            self.trainer.train(num_episodes, monitor_kwargs)
+            return
+        
+        monitor = ConvergenceMonitor(**monitor_kwargs) if monitor_kwargs else None
+        self.training_thread = threading.Thread(target=self._train, args=(num_episodes, monitor), daemon=True)
         self.training_thread.start()
     
     def train_custom(self):
@@ -579,15 +529,7 @@ class ModernQLearningGUI:
                     raise ValueError
                 dialog.destroy()
                 
-                self.training = True
-                self.train_button.config(state=tk.DISABLED)
-                self.train_custom_button.config(state=tk.DISABLED)
-                self.stop_button.config(state=tk.NORMAL)
-                
-                self.training_thread = threading.Thread(target=self._train, 
-                                                       args=(num_episodes,), 
-                                                       daemon=True)
-                self.training_thread.start()
+                self._start_training(num_episodes)
             except ValueError:
                 messagebox.showerror("Erro", "Por favor, insira um número válido de episódios.")
         
@@ -601,54 +543,81 @@ class ModernQLearningGUI:
         entry.focus()
     
     def stop_training(self):
+        if self.trainer is not None and self.training:
+            self.trainer.stop()
         self.training = False
         self.train_button.config(state=tk.NORMAL)
         self.train_custom_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
     
     def reset_q_table(self):
-        if self.training:
+        if self.training or (self.training_thread is not None and self.training_thread.is_alive()):
             messagebox.showwarning("Treinamento em andamento", 
                                  "Pare o treinamento antes de resetar.")
             return
         
         if messagebox.askyesno("Confirmar", "Tem certeza que deseja resetar a matriz Q?"):
-            self.agent.Q = np.zeros((self.agent.num_states, self.agent.num_actions))
-            self.agent.episode_rewards = []
-            self.agent.episode_lengths = []
-            self.agent.total_episodes = 0
-            self.agent.epsilon = 1.0
-            self.reward_history = []
-            self.win_rate_history = []
-            self.epsilon_history = []
-            self.episode_numbers = []
+            if self.trainer is not None:
+                self.trainer.reset()
+                return
+            self.agent.reset()
+            self.history.clear()
             self.update_all_visualizations()
     
-    def _train(self, num_episodes: int):
-        episodes_per_update = max(1, num_episodes // 50)
+    def _on_close(self):
+        if self.trainer is not None:
+            self.trainer.close()
+        self.root.destroy()
+    
+    def _train(self, num_episodes: int, monitor: ConvergenceMonitor = None):
+        profile = self.profile
+        if profile is not None:
+            profile.reset()
+            profile.begin()
+        episodes_done = 0
         
         for episode in range(num_episodes):
             if not self.training:
                 break
             
-            self.agent.train_episode(self.env)
+            if profile is not None and profile.should_sample():
+                self.agent._train_episode_profiled(self.env, profile)
+            else:
+                self.agent.train_episode(self.env)
+            episodes_done = episode + 1
+            
+            if monitor is not None and episodes_done % monitor.check_every == 0 and monitor.check(self.agent):
+                break
             
-            if (episode + 1) % episodes_per_update == 0 or (episode + 1) == num_episodes:
-                progress = ((episode + 1) / num_episodes) * 100
-                self.root.after(0, self.update_all_visualizations)
-                self.root.after(0, lambda p=progress: self.root.title(
-                    f"🎰 Q-Learning Blackjack - Visualização Interativa (Treinando... {p:.1f}%)"))
-        
-        self.root.after(0, lambda: self.root.title("🎰 Q-Learning Blackjack - Visualização Interativa"))
-        self.root.after(0, self.update_all_visualizations)
-        self.root.after(0, self.stop_training)
-        self.root.after(0, lambda: messagebox.showinfo("Treinamento Completo", 
-                                                      f"✅ Treinamento de {num_episodes} episódios concluído!"))
+            if self.agent.total_episodes % self.HISTORY_EVERY == 0:
+                if profile is not None:
+                    with profile.phase('gui'):
+                        self._publish_progress(episodes_done, num_episodes)
+                else:
+                    self._publish_progress(episodes_done, num_episodes)
+        
+        reason = monitor.reason if monitor is not None else None
+        message = completion_message(episodes_done, num_episodes, reason)
+        
+        if profile is not None:
+            profile.end()
+            print(profile.format_report())
+        
+        self.channel.publish(TrainingSnapshot.capture(
+            self.agent, self.history, episode=episodes_done, num_episodes=num_episodes,
+            finished=True, message=message))
+    
+    def _publish_progress(self, episodes_done: int, num_episodes: int):
+        self.history.record(self.agent.get_stats())
+        if self.channel.due():
+            self.channel.publish(TrainingSnapshot.capture(
+                self.agent, self.history, episode=episodes_done, num_episodes=num_episodes))
 
 
 def main():
     root = tk.Tk()
-    app = ModernQLearningGUI(root)
+    app = ModernQLearningGUI(root, use_process='--process' in sys.argv, profile='--profile' in sys.argv,
+                             extended_state='--extended' in sys.argv)
     root.mainloop()
 
 
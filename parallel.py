@@ -0,0 +1,258 @@
+import multiprocessing as mp
+import threading
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Iterable, Optional, Tuple
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from rng import spawn_seeds, SeedLike
+from callbacks import Callback, CallbackList, as_callback_list
+
+
+class SharedArray:
+
+    def __init__(self, shape: Tuple[int, ...], dtype, name: Optional[str] = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+
+        if self.owner:
+            size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        if self.owner:
+            self.array[...] = 0
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        return self.shm.name, self.shape, self.dtype.str
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, Tuple[int, ...], str]) -> 'SharedArray':
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self):
+        del self.array
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def decayed_epsilon(epsilon: float, epsilon_decay: float, epsilon_min: float, num_episodes: int) -> float:
+    for _ in range(num_episodes):
+        if epsilon <= epsilon_min:
+            break
+        epsilon *= epsilon_decay
+    return epsilon
+
+
+def _worker(worker_id: int, num_workers: int, params: dict, specs: dict, barrier, seed: np.random.SeedSequence):
+    arrays = {}
+    try:
+        for key, spec in specs.items():
+            arrays[key] = SharedArray.attach(spec)
+        _worker_loop(worker_id, num_workers, params, arrays, barrier, seed)
+    except threading.BrokenBarrierError:
+        pass
+    except BaseException:
+        # Quebra a barreira para que o processo principal e os demais não esperem para sempre
+        barrier.abort()
+        raise
+    finally:
+        for shared in arrays.values():
+            shared.close()
+
+
+def _worker_loop(worker_id: int, num_workers: int, params: dict, arrays: dict, barrier, seed: np.random.SeedSequence):
+    global_Q = arrays['global_Q'].array
+    local_Q = arrays['local_Q'].array[worker_id]
+    visits = arrays['visits'].array[worker_id]
+    rewards = arrays['rewards'].array[worker_id]
+    lengths = arrays['lengths'].array[worker_id]
+    control = arrays['control'].array
+    counts = arrays['counts'].array
+
+    env_seed, agent_seed = seed.spawn(2)
+    env = BlackjackEnv(rng=env_seed, **params['env_kwargs'])
+    agent = QLearningAgent(
+        num_states=params['num_states'],
+        num_actions=params['num_actions'],
+        alpha=params['alpha'],
+        gamma=params['gamma'],
+        epsilon_decay=params['epsilon_decay'] ** num_workers,
+        epsilon_min=params['epsilon_min'],
+        stats_window=rewards.shape[0],
+        rng=agent_seed
+    )
+
+    while True:
+        barrier.wait()
+        num_episodes = int(counts[worker_id])
+        if num_episodes < 0:
+            break
+
+        agent.Q[:] = global_Q
+        agent.epsilon = float(control[0])
+        agent.stats.reset()
+        visits[:] = 0
+
+        if num_episodes > 0:
+            agent._train_fast(env, num_episodes, visits=visits)
+
+        local_Q[:] = agent.Q
+        rewards[:num_episodes] = agent.stats.recent_rewards()
+        lengths[:num_episodes] = agent.stats.recent_lengths()
+
+        barrier.wait()
+
+
+class ParallelTrainer:
+
+    def __init__(
+        self,
+        agent: QLearningAgent,
+        num_workers: Optional[int] = None,
+        sync_every: int = 1000,
+        merge: str = 'visits',
+        seed: SeedLike = None,
+        env_kwargs: Optional[dict] = None,
+        timeout: Optional[float] = 300.0
+    ):
+        if merge not in ('average', 'visits'):
+            raise ValueError(f"Modo de combinação desconhecido: {merge!r}. Use 'average' ou 'visits'.")
+        # Os processos sempre treinam um QLearningAgent; outro algoritmo seria trocado em silêncio
+        if type(agent) is not QLearningAgent:
+            raise ValueError(f"ParallelTrainer só suporta QLearningAgent, não {type(agent).__name__}.")
+
+        self.agent = agent
+        self.num_workers = num_workers or mp.cpu_count()
+        self.sync_every = sync_every
+        self.merge = merge
+        self.seed = seed
+        self.env_kwargs = dict(env_kwargs or {})
+        self.timeout = timeout
+
+    def _merge(self, global_Q: np.ndarray, local_Q: np.ndarray, visits: np.ndarray) -> np.ndarray:
+        if self.merge == 'average':
+            return local_Q.mean(axis=0)
+
+        total_visits = visits.sum(axis=0)
+        weighted = (local_Q * visits).sum(axis=0)
+        return np.where(total_visits > 0, weighted / np.maximum(total_visits, 1), global_Q)
+
+    def train(self, num_episodes: int, verbose: bool = True, callbacks: Optional[Iterable[Callback]] = None):
+        agent = self.agent
+        k = self.num_workers
+        m = self.sync_every
+
+        shared = {
+            'global_Q': SharedArray(agent.Q.shape, np.float64),
+            'local_Q': SharedArray((k,) + agent.Q.shape, np.float64),
+            'visits': SharedArray((k,) + agent.Q.shape, np.int64),
+            'rewards': SharedArray((k, m), np.float64),
+            'lengths': SharedArray((k, m), np.int64),
+            'control': SharedArray((1,), np.float64),
+            'counts': SharedArray((k,), np.int64),
+        }
+        specs = {key: array.spec for key, array in shared.items()}
+        params = {
+            'num_states': agent.num_states,
+            'num_actions': agent.num_actions,
+            'alpha': agent.alpha,
+            'gamma': agent.gamma,
+            'epsilon_decay': agent.epsilon_decay,
+            'epsilon_min': agent.epsilon_min,
+            'env_kwargs': self.env_kwargs,
+        }
+        seeds = spawn_seeds(self.seed, k)
+
+        barrier = mp.Barrier(k + 1)
+        workers = [
+            mp.Process(target=_worker, args=(w, k, params, specs, barrier, seeds[w]), daemon=True)
+            for w in range(k)
+        ]
+        for worker in workers:
+            worker.start()
+
+        if verbose:
+            print(f"Iniciando treinamento paralelo por {num_episodes} episódios "
+                  f"({k} processos, sincronização a cada {m} episódios)...")
+
+        try:
+            self._run_rounds(num_episodes, shared, barrier, verbose, as_callback_list(callbacks))
+        except threading.BrokenBarrierError:
+            raise RuntimeError(self._failure_message(workers)) from None
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            for array in shared.values():
+                array.close()
+
+    def _failure_message(self, workers) -> str:
+        for worker in workers:
+            worker.join(timeout=1)
+        failed = [(w, worker.exitcode) for w, worker in enumerate(workers)
+                  if worker.exitcode not in (None, 0)]
+        if failed:
+            details = ", ".join(f"{w} (código de saída {code})" for w, code in failed)
+            return f"Processo(s) de treinamento falharam: {details}."
+        return f"Os processos de treinamento não sincronizaram em {self.timeout}s."
+
+    def _run_rounds(self, num_episodes: int, shared: dict, barrier, verbose: bool,
+                    callbacks: Optional[CallbackList] = None):
+        agent = self.agent
+        k = self.num_workers
+        m = self.sync_every
+        global_Q = shared['global_Q'].array
+        counts = shared['counts'].array
+        control = shared['control'].array
+
+        global_Q[:] = agent.Q
+        remaining = num_episodes
+        if callbacks is not None:
+            callbacks.begin(agent)
+
+        while remaining > 0:
+            round_episodes = min(remaining, k * m)
+            counts[:] = round_episodes // k
+            counts[:round_episodes % k] += 1
+            control[0] = agent.epsilon
+
+            barrier.wait(self.timeout)
+            barrier.wait(self.timeout)
+
+            global_Q[:] = self._merge(global_Q, shared['local_Q'].array, shared['visits'].array)
+            agent.Q[:] = global_Q
+            agent.epsilon = decayed_epsilon(agent.epsilon, agent.epsilon_decay,
+                                            agent.epsilon_min, round_episodes)
+            first_episode = agent.total_episodes + 1
+            agent.total_episodes += round_episodes
+
+            for w in range(k):
+                n = int(counts[w])
+                rewards = shared['rewards'].array[w, :n]
+                lengths = shared['lengths'].array[w, :n]
+                agent.stats.record_many(rewards, lengths)
+                if callbacks is not None and callbacks.wants_episodes:
+                    callbacks.episodes_end(agent, first_episode, rewards.tolist(), lengths.tolist())
+                    first_episode += n
+
+            if callbacks is not None:
+                callbacks.batch_end(agent)
+
+            remaining -= round_episodes
+
+            if verbose:
+                print(f"Episódio {num_episodes - remaining}/{num_episodes} | "
+                      f"Recompensa média: {agent.stats.avg_reward:.3f} | "
+                      f"Passos médios: {agent.stats.avg_length:.2f} | "
+                      f"Epsilon: {agent.epsilon:.3f}")
+
+        counts[:] = -1
+        barrier.wait(self.timeout)
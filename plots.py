@@ -0,0 +1,360 @@
+import time
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import PolyCollection
+from matplotlib.backends.backend_agg import get_hinting_flag
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties, findfont, get_font
+
+
+class LabeledCells(Artist):
+
+    # Células coloridas com os rótulos já rasterizados numa imagem RGBA do tamanho dos eixos
+    # em pixels: redesenhar é só copiar a imagem, sem reamostragem nem layout de texto
+    def __init__(self, num_rows: int, num_cols: int, fontsize: float = 7):
+        super().__init__()
+        self.colors = [[(0, 0, 0, 0)] * num_cols for _ in range(num_rows)]
+        self.labels = [[''] * num_cols for _ in range(num_rows)]
+        self._font = get_font(findfont(FontProperties(size=fontsize, weight='bold')))
+        self._fontsize = fontsize
+        self._masks = {}
+        self._dpi = None
+        self._rgba = None
+        self._painted = None
+
+    def set_cells(self, colors, labels):
+        self.colors = colors
+        self.labels = labels
+        self.stale = True
+
+    def _label_mask(self, label: str) -> np.ndarray:
+        mask = self._masks.get(label)
+        if mask is None:
+            font = self._font
+            font.clear()
+            font.set_size(self._fontsize, self._dpi)
+            font.set_text(label, 0.0, flags=get_hinting_flag())
+            font.draw_glyphs_to_bitmap(antialiased=True)
+            mask = self._masks[label] = np.asarray(font.get_image(), dtype=np.uint16)[..., None]
+        return mask
+
+    def _resize(self, width: int, height: int, dpi: float):
+        num_rows, num_cols = len(self.labels), len(self.labels[0])
+        self._rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        self._xs = np.linspace(0, width, num_cols + 1).round().astype(int)
+        self._ys = np.linspace(0, height, num_rows + 1).round().astype(int).tolist()
+        self._painted = [None] * num_rows
+        if dpi != self._dpi:
+            self._dpi = dpi
+            self._masks = {}
+
+    def _paint_row(self, i: int, colors, labels):
+        # Uma cópia por faixa de linha; preencher célula a célula custa mais que a linha toda
+        band = self._rgba[self._ys[i]:self._ys[i + 1]]
+        band[:] = np.repeat(np.array(colors, dtype=np.uint8), np.diff(self._xs), axis=0)
+
+        # Rótulo preto: cada pixel escurece na proporção da cobertura do glifo
+        height = band.shape[0]
+        for left, right, label in zip(self._xs[:-1].tolist(), self._xs[1:].tolist(), labels):
+            mask = self._label_mask(label)
+            h, w = min(mask.shape[0], height), min(mask.shape[1], right - left)
+            y, x = (height - h) // 2, left + (right - left - w) // 2
+            region = band[y:y + h, x:x + w, :3]
+            region[:] = region * (255 - mask[:h, :w]) // 255
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        bbox = self.axes.bbox
+        x0, y0 = round(bbox.x0), round(bbox.y0)
+        width, height = round(bbox.x1) - x0, round(bbox.y1) - y0
+        if width <= 0 or height <= 0:
+            return
+        if self._rgba is None or self._rgba.shape[:2] != (height, width) or renderer.dpi != self._dpi:
+            self._resize(width, height, renderer.dpi)
+
+        for i, row in enumerate(zip(self.colors, self.labels)):
+            if self._painted[i] != row:
+                self._paint_row(i, *row)
+                self._painted[i] = row
+
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(bbox)
+        renderer.draw_image(gc, x0, y0, self._rgba[::-1])
+        gc.restore()
+        self.stale = False
+
+
+class HeatmapRenderer:
+
+    def __init__(self, fig: Figure, num_states: int = 18, actions=('HIT', 'STAND'), blit: bool = True):
+        self.fig = fig
+        self.num_states = num_states
+        self.actions = list(actions)
+        self.blit = blit
+        self._drawn = False
+
+        ax = fig.add_subplot(111)
+        ax.set_facecolor('#1a1a2e')
+        self.ax = ax
+
+        states = [f'{i+4}' for i in range(num_states)]
+        # A imagem só define eixos, cores e colorbar; quem desenha as células é LabeledCells
+        self.im = ax.imshow(np.zeros((len(self.actions), num_states)), cmap='RdYlGn',
+                            aspect='auto', interpolation='nearest', vmin=-1, vmax=1,
+                            visible=False)
+        self.cells = ax.add_artist(LabeledCells(len(self.actions), num_states))
+        self.cells.set_animated(blit)
+
+        ax.set_xticks(range(len(states)))
+        ax.set_xticklabels(states, color='white', fontsize=8)
+        ax.set_yticks(range(len(self.actions)))
+        ax.set_yticklabels(self.actions, color='white', fontsize=10, fontweight='bold')
+        ax.set_xlabel('Valor da Mão (Estado)', color='white', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Ação', color='white', fontsize=12, fontweight='bold')
+        ax.set_title('🔥 Matriz Q - Heatmap Interativo',
+                     color='#00d4ff', fontsize=14, fontweight='bold', pad=15)
+
+        cbar = fig.colorbar(self.im, ax=ax)
+        cbar.ax.set_ylabel('Valor Q', color='white', fontsize=10)
+        cbar.ax.tick_params(colors='white')
+        self.cbar = cbar
+
+        for spine in ax.spines.values():
+            spine.set_color('white')
+
+        ax.tick_params(colors='white')
+        fig.patch.set_facecolor('#1a1a2e')
+
+        if blit:
+            fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self._drawn = True
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.cells)
+
+    def _update_clim(self, values: np.ndarray) -> bool:
+        vmin, vmax = float(values.min()), float(values.max())
+        low, high = self.im.get_clim()
+        span = max(vmax - vmin, 1e-6)
+
+        if vmin >= low and vmax <= high and (high - low) <= 4 * span:
+            return False
+
+        padding = 0.1 * span
+        self.im.set_clim(vmin - padding, vmax + padding)
+        return True
+
+    def update(self, Q: np.ndarray):
+        values = np.asarray(Q).T
+        self.im.set_data(values)
+        clim_changed = self._update_clim(values)
+
+        colors = self.im.to_rgba(values, bytes=True).tolist()
+        labels = [[f'{value:.2f}' for value in row] for row in values.tolist()]
+        self.cells.set_cells(colors, labels)
+
+        canvas = self.fig.canvas
+        if not self.blit or clim_changed or not self._drawn:
+            canvas.draw_idle()
+        else:
+            # As células são opacas e cobrem os eixos inteiros: não há fundo a restaurar
+            self._draw_animated()
+            canvas.blit(self.ax.bbox)
+
+
+class LearningCurvesRenderer:
+
+    def __init__(self, fig: Figure, num_states: int = 18, fps: float = 10.0, blit: bool = True):
+        self.fig = fig
+        self.num_states = num_states
+        self.min_interval = 1.0 / fps
+        self.blit = blit
+        self._background = None
+        self._last_draw = 0.0
+        self._timer = None
+        self._full_redraw = False
+        self._has_data = None
+
+        self.placeholder = fig.text(0.5, 0.5, 'Inicie o treinamento para ver os gráficos',
+                                    ha='center', va='center', color='white', fontsize=14)
+
+        self.ax1 = fig.add_subplot(221)
+        self.reward_line, = self.ax1.plot([], [], color='#00ff88', linewidth=2,
+                                          label='Recompensa Média', animated=blit)
+        self.reward_fill = self._add_fill(self.ax1, '#00ff88')
+        self._style(self.ax1, 'Episódio', 'Recompensa', '💰 Recompensa ao Longo do Tempo', '#00ff88')
+
+        self.ax2 = fig.add_subplot(222)
+        self.win_line, = self.ax2.plot([], [], color='#00d4ff', linewidth=2,
+                                       label='Taxa de Vitória', animated=blit)
+        self.win_fill = self._add_fill(self.ax2, '#00d4ff')
+        self.ax2.set_ylim([0, 1])
+        self._style(self.ax2, 'Episódio', 'Taxa (%)', '🏆 Taxa de Vitória', '#00d4ff')
+
+        self.ax3 = fig.add_subplot(223)
+        self.epsilon_line, = self.ax3.plot([], [], color='#ffaa00', linewidth=2,
+                                           label='Epsilon', animated=blit)
+        self._style(self.ax3, 'Episódio', 'Epsilon', '🎯 Decaimento do Epsilon (Exploração)', '#ffaa00')
+
+        self.ax4 = fig.add_subplot(224)
+        x = [s + 4 for s in range(num_states)]
+        x_pos = np.arange(num_states)
+        width = 0.35
+        self.hit_bars = self.ax4.bar(x_pos - width/2, np.zeros(num_states), width, label='HIT',
+                                     color='#00d4ff', alpha=0.8)
+        self.stand_bars = self.ax4.bar(x_pos + width/2, np.zeros(num_states), width, label='STAND',
+                                       color='#00ff88', alpha=0.8)
+        for bar in list(self.hit_bars) + list(self.stand_bars):
+            bar.set_animated(blit)
+        self.ax4.set_xticks(x_pos[::3])
+        self.ax4.set_xticklabels(x[::3], color='white')
+        self.ax4.set_ylim(-1, 1)
+        self._style(self.ax4, 'Valor da Mão', 'Valor Q', '⚔️ Comparação HIT vs STAND por Estado', 'white',
+                    grid_axis='y')
+
+        self.line_axes = (self.ax1, self.ax2, self.ax3)
+        self.all_axes = self.line_axes + (self.ax4,)
+        for ax in self.line_axes:
+            ax.set_xlim(0, 1)
+        self.ax1.set_ylim(-1, 1)
+        self.ax3.set_ylim(0, 1)
+
+        fig.patch.set_facecolor('#1a1a2e')
+        self._set_has_data(False)
+
+        if blit:
+            fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _style(self, ax, xlabel: str, ylabel: str, title: str, title_color: str, grid_axis: str = 'both'):
+        ax.set_facecolor('#1a1a2e')
+        ax.set_xlabel(xlabel, color='white', fontweight='bold')
+        ax.set_ylabel(ylabel, color='white', fontweight='bold')
+        ax.set_title(title, color=title_color, fontweight='bold', pad=10)
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.3, color='white', axis=grid_axis)
+        ax.legend(loc='best', facecolor='#16213e', edgecolor='white', labelcolor='white')
+        for spine in ax.spines.values():
+            spine.set_color('white')
+
+    def _set_has_data(self, has_data: bool) -> bool:
+        if has_data == self._has_data:
+            return False
+        self._has_data = has_data
+        self.placeholder.set_visible(not has_data)
+        for ax in self.all_axes:
+            ax.set_visible(has_data)
+        return True
+
+    def _animated_artists(self):
+        artists = [(self.ax1, self.reward_fill), (self.ax1, self.reward_line),
+                   (self.ax2, self.win_fill), (self.ax2, self.win_line),
+                   (self.ax3, self.epsilon_line)]
+        artists += [(self.ax4, bar) for bar in self.hit_bars]
+        artists += [(self.ax4, bar) for bar in self.stand_bars]
+        return artists
+
+    def _on_draw(self, event):
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        if not self._has_data:
+            return
+        for ax, artist in self._animated_artists():
+            ax.draw_artist(artist)
+
+    def _add_fill(self, ax, color: str) -> PolyCollection:
+        fill = PolyCollection([], alpha=0.3, color=color, animated=self.blit)
+        ax.add_collection(fill, autolim=False)
+        return fill
+
+    def _set_fill(self, fill: PolyCollection, x: np.ndarray, y: np.ndarray):
+        # Mesmo polígono do fill_between(x, y): a curva e a volta pela linha de base y = 0
+        xs = np.concatenate((x[:1], x, x[-1:]))
+        ys = np.concatenate(([0.0], y, [0.0]))
+        fill.set_verts([np.column_stack((xs, ys))])
+
+    def _update_xlim(self, x: np.ndarray) -> bool:
+        low, high = self.ax1.get_xlim()
+        x_min, x_max = float(x[0]), float(x[-1])
+        if x_max <= high and x_min <= low + (high - low) / 2:
+            return False
+
+        new_high = max(x_max, 1.0)
+        new_high = x_min + 1.25 * max(new_high - x_min, 1.0)
+        for ax in self.line_axes:
+            ax.set_xlim(x_min, new_high)
+        return True
+
+    def _expand_ylim(self, ax, values: np.ndarray, floor: float = None) -> bool:
+        low, high = ax.get_ylim()
+        v_min, v_max = float(np.min(values)), float(np.max(values))
+        if v_min >= low and v_max <= high:
+            return False
+
+        padding = 0.1 * max(v_max - v_min, 0.1)
+        new_low = min(low, v_min - padding)
+        if floor is not None:
+            new_low = max(new_low, floor)
+        ax.set_ylim(new_low, max(high, v_max + padding))
+        return True
+
+    def update(self, episodes, rewards, win_rates, epsilons, Q: np.ndarray, force: bool = False):
+        full_redraw = self._set_has_data(len(episodes) > 0)
+
+        if self._has_data:
+            x = np.asarray(episodes, dtype=float)
+            rewards = np.asarray(rewards, dtype=float)
+            win_rates = np.asarray(win_rates, dtype=float)
+            epsilons = np.asarray(epsilons, dtype=float)
+
+            self.reward_line.set_data(x, rewards)
+            self.win_line.set_data(x, win_rates)
+            self.epsilon_line.set_data(x, epsilons)
+            self._set_fill(self.reward_fill, x, rewards)
+            self._set_fill(self.win_fill, x, win_rates)
+
+            Q = np.asarray(Q)
+            for bar, height in zip(self.hit_bars, Q[:, 0].tolist()):
+                bar.set_height(height)
+            for bar, height in zip(self.stand_bars, Q[:, 1].tolist()):
+                bar.set_height(height)
+
+            full_redraw |= self._update_xlim(x)
+            full_redraw |= self._expand_ylim(self.ax1, rewards)
+            full_redraw |= self._expand_ylim(self.ax3, epsilons, floor=0.0)
+            full_redraw |= self._expand_ylim(self.ax4, Q)
+
+        self._full_redraw |= full_redraw
+        self._request_draw(force)
+
+    def _request_draw(self, force: bool):
+        now = time.perf_counter()
+        wait = self.min_interval - (now - self._last_draw)
+        if not force and wait > 0:
+            if self._timer is None:
+                self._timer = self.fig.canvas.new_timer(interval=int(wait * 1000) + 1)
+                self._timer.single_shot = True
+                self._timer.add_callback(self._flush)
+                self._timer.start()
+            return
+        self._flush()
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._last_draw = time.perf_counter()
+
+        canvas = self.fig.canvas
+        if not self.blit or self._full_redraw or self._background is None:
+            self._full_redraw = False
+            canvas.draw_idle()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_animated()
+            canvas.blit(self.fig.bbox)
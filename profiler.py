@@ -0,0 +1,132 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import List
+
+
+PHASE_LABELS = {
+    'reset': 'env.reset',
+    'step': 'env.step',
+    'get_action': 'get_action',
+    'update': 'update',
+    'bookkeeping': 'estatísticas/epsilon',
+    'train_fast': 'laço rápido (fundido)',
+    'stopping': 'critério de parada',
+    'callbacks': 'callbacks',
+    'checkpoint': 'checkpoint',
+    'gui': 'envio à interface',
+    'other': 'outros',
+}
+
+
+class PhaseProfiler:
+
+    def __init__(self, sample_every: int = 100):
+        if sample_every < 1:
+            raise ValueError("sample_every deve ser >= 1.")
+
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        self.totals = {}
+        self.calls = {}
+        self.sampled = {}
+        self.episodes = 0
+        self.sampled_episodes = 0
+        self.wall_time = 0.0
+        self._start = None
+
+    def begin(self):
+        self._start = time.perf_counter()
+
+    def end(self):
+        if self._start is not None:
+            self.wall_time += time.perf_counter() - self._start
+            self._start = None
+
+    def should_sample(self) -> bool:
+        self.episodes += 1
+        if self.episodes % self.sample_every:
+            return False
+        self.sampled_episodes += 1
+        return True
+
+    def count_episodes(self, n: int):
+        self.episodes += n
+
+    def add(self, phase: str, seconds: float, calls: int = 1, sampled: bool = True):
+        self.totals[phase] = self.totals.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+        self.sampled[phase] = sampled
+
+    @contextmanager
+    def phase(self, name: str, sampled: bool = False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, sampled=sampled)
+
+    def _scale(self, phase: str) -> float:
+        if not self.sampled[phase]:
+            return 1.0
+        return self.episodes / self.sampled_episodes if self.sampled_episodes else 0.0
+
+    def report(self) -> List[dict]:
+        estimates = {phase: total * self._scale(phase) for phase, total in self.totals.items()}
+        accounted = sum(estimates.values())
+        reference = max(self.wall_time, accounted)
+
+        rows = []
+        for phase in sorted(estimates, key=estimates.get, reverse=True):
+            calls = self.calls[phase]
+            rows.append({
+                'phase': phase,
+                'calls': calls,
+                'measured_s': self.totals[phase],
+                'mean_us': 1e6 * self.totals[phase] / calls,
+                'estimated_s': estimates[phase],
+                'share': estimates[phase] / reference if reference > 0 else 0.0,
+                'sampled': self.sampled[phase],
+            })
+        if self.wall_time > accounted:
+            rows.append({
+                'phase': 'other',
+                'calls': 0,
+                'measured_s': self.wall_time - accounted,
+                'mean_us': 0.0,
+                'estimated_s': self.wall_time - accounted,
+                'share': (self.wall_time - accounted) / reference,
+                'sampled': False,
+            })
+        return rows
+
+    def to_dict(self) -> dict:
+        return {
+            'sample_every': self.sample_every,
+            'episodes': self.episodes,
+            'sampled_episodes': self.sampled_episodes,
+            'wall_time': self.wall_time,
+            'phases': self.report(),
+        }
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format_report(self) -> str:
+        lines = [
+            f"Perfil de {self.episodes:,} episódios ({self.sampled_episodes:,} amostrados, "
+            f"1 a cada {self.sample_every}); tempo total {self.wall_time:.3f}s",
+            f"{'Fase':<24} {'Chamadas':>10} {'Médio (µs)':>11} {'Estimado (s)':>13} {'%':>7}",
+        ]
+        for row in self.report():
+            label = PHASE_LABELS.get(row['phase'], row['phase'])
+            if row['sampled']:
+                label += '*'
+            lines.append(f"{label:<24} {row['calls']:>10,} {row['mean_us']:>11.2f} "
+                         f"{row['estimated_s']:>13.4f} {row['share'] * 100:>6.1f}%")
+        if any(self.sampled.values()):
+            lines.append("* fase medida por amostragem e extrapolada para todos os episódios")
+        return "\n".join(lines)
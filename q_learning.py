@@ -1,10 +1,44 @@
+import time
 import numpy as np
 import random
-from typing import Tuple
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional, Tuple
 from blackjack_env import BlackjackEnv, Action
+from stats import EpisodeStats
+from convergence import ConvergenceMonitor, STOP_REASONS
+from checkpoint import write_checkpoint, read_header, read_array
+from rng import BlockRandom, SeedLike
+from callbacks import Callback, as_callback_list
+from profiler import PhaseProfiler
+
+
+# Arrays que todo checkpoint tem; os demais vêm de _checkpoint_arrays()
+CHECKPOINT_ARRAYS = ('Q', 'stats_rewards', 'stats_lengths')
+
+
+def average_update(Q: np.ndarray, alpha: float, states: np.ndarray, actions: np.ndarray,
+                   targets: np.ndarray) -> np.ndarray:
+    flat_Q = Q.reshape(-1)
+    flat_idx = states * Q.shape[1] + actions
+    td_errors = targets - flat_Q[flat_idx]
+
+    td_sums = np.bincount(flat_idx, weights=td_errors, minlength=flat_Q.size)
+    counts = np.bincount(flat_idx, minlength=flat_Q.size)
+    touched = counts > 0
+
+    steps = np.zeros_like(flat_Q)
+    steps[touched] = alpha * td_sums[touched] / counts[touched]
+    return steps.reshape(Q.shape)
+
+
+def _untimed(phase: str):
+    return nullcontext()
 
 
 class QLearningAgent:
+    
+    name = 'q_learning'
+    
     def __init__(
         self,
         num_states: int = 18,
@@ -13,28 +47,53 @@ class QLearningAgent:
         gamma: float = 0.95,
         epsilon: float = 1.0,
         epsilon_decay: float = 0.995,
-        epsilon_min: float = 0.01
+        epsilon_min: float = 0.01,
+        stats_window: int = 1000,
+        history_path: Optional[str] = None,
+        rng: SeedLike = None,
+        block_size: int = 4096
     ):
         self.num_states = num_states
         self.num_actions = num_actions
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.initial_epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.epsilon_min = epsilon_min
         
         self.Q = np.zeros((num_states, num_actions))
         
-        self.episode_rewards = []
-        self.episode_lengths = []
+        self.stats = EpisodeStats(window=stats_window, history_path=history_path)
         self.total_episodes = 0
+        self.stop_reason = None
+        
+        self.random = BlockRandom(rng, block_size) if rng is not None else None
+    
+    @property
+    def episode_rewards(self) -> np.ndarray:
+        return self.stats.recent_rewards()
+    
+    @property
+    def episode_lengths(self) -> np.ndarray:
+        return self.stats.recent_lengths()
+    
+    def reset(self):
+        self.Q = np.zeros((self.num_states, self.num_actions))
+        self.stats.reset()
+        self.total_episodes = 0
+        self.epsilon = self.initial_epsilon
         
     def get_action(self, state: int, training: bool = True) -> Action:
-        if training and random.random() < self.epsilon:
-            return random.choice(list(Action))
-        else:
-            action_idx = np.argmax(self.Q[state, :])
-            return Action(action_idx)
+        if training:
+            if self.random is None:
+                if random.random() < self.epsilon:
+                    return random.choice(list(Action))
+            elif self.random.random() < self.epsilon:
+                return Action(self.random.integers(0, self.num_actions))
+        
+        action_idx = np.argmax(self.Q[state, :])
+        return Action(action_idx)
     
     def update(self, state: int, action: Action, reward: float, next_state: int, done: bool):
         action_idx = action.value
@@ -47,7 +106,51 @@ class QLearningAgent:
             target_q = reward + self.gamma * max_next_q
         
         self.Q[state, action_idx] = current_q + self.alpha * (target_q - current_q)
-    
+
+    def update_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+        mode: str = 'sequential'
+    ):
+        states = np.asarray(states, dtype=np.intp)
+        actions = np.asarray(actions, dtype=np.intp)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        next_states = np.asarray(next_states, dtype=np.intp)
+        dones = np.asarray(dones, dtype=bool)
+
+        if mode == 'sequential':
+            self._update_batch_sequential(states, actions, rewards, next_states, dones)
+        elif mode == 'average':
+            self._update_batch_average(states, actions, rewards, next_states, dones)
+        else:
+            raise ValueError(f"Modo de atualização desconhecido: {mode!r}. Use 'sequential' ou 'average'.")
+
+    def _update_batch_sequential(self, states, actions, rewards, next_states, dones):
+        q = self.Q.tolist()
+        alpha = self.alpha
+        gamma = self.gamma
+
+        for s, a, r, s2, d in zip(states.tolist(), actions.tolist(), rewards.tolist(),
+                                  next_states.tolist(), dones.tolist()):
+            row = q[s]
+            current_q = row[a]
+            if d:
+                target_q = r
+            else:
+                target_q = r + gamma * max(q[s2])
+            row[a] = current_q + alpha * (target_q - current_q)
+
+        self.Q[:] = q
+
+    def _update_batch_average(self, states, actions, rewards, next_states, dones):
+        max_next_q = self.Q[next_states].max(axis=1)
+        targets = np.where(dones, rewards, rewards + self.gamma * max_next_q)
+        self.Q += average_update(self.Q, self.alpha, states, actions, targets)
+
     def decay_epsilon(self):
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
@@ -69,40 +172,342 @@ class QLearningAgent:
             steps += 1
         
         self.total_episodes += 1
-        self.episode_rewards.append(total_reward)
-        self.episode_lengths.append(steps)
+        self.stats.record(total_reward, steps)
+        
+        self.decay_epsilon()
+        
+        return total_reward, steps
+    
+    def _train_episode_profiled(self, env: BlackjackEnv, profile: PhaseProfiler) -> Tuple[float, int]:
+        clock = time.perf_counter
+        add = profile.add
+        
+        t0 = clock()
+        state = env.reset()
+        add('reset', clock() - t0)
+        total_reward = 0.0
+        steps = 0
+        
+        while not env.done:
+            t0 = clock()
+            action = self.get_action(state, training=True)
+            t1 = clock()
+            next_state, reward, done, info = env.step(action)
+            t2 = clock()
+            self.update(state, action, reward, next_state, done)
+            t3 = clock()
+            add('get_action', t1 - t0)
+            add('step', t2 - t1)
+            add('update', t3 - t2)
+            
+            state = next_state
+            total_reward += reward
+            steps += 1
         
+        t0 = clock()
+        self.total_episodes += 1
+        self.stats.record(total_reward, steps)
         self.decay_epsilon()
+        add('bookkeeping', clock() - t0)
         
         return total_reward, steps
     
-    def train(self, env: BlackjackEnv, num_episodes: int = 10000):
-        print(f"Iniciando treinamento por {num_episodes} episódios...")
+    def _train_fast(
+        self,
+        env: BlackjackEnv,
+        num_episodes: int,
+        visits: Optional[np.ndarray] = None
+    ) -> Tuple[List[float], List[int]]:
+        q = self.Q.tolist()
+        counts = visits.tolist() if visits is not None else None
+        rewards_buf = [0.0] * num_episodes
+        lengths_buf = [0] * num_episodes
+        actions, rand, random_index = self._fast_sampler()
+        learn, end_episode, end_run = self._fast_hooks(q, actions, rand, random_index)
+        
+        reset = env.reset
+        step = env.step_fast
+        epsilon = self.epsilon
+        epsilon_decay = self.epsilon_decay
+        epsilon_min = self.epsilon_min
         
         for episode in range(num_episodes):
-            reward, steps = self.train_episode(env)
+            state = reset()
+            total_reward = 0.0
+            steps = 0
+            done = False
+            action = None
+            
+            while not done:
+                if action is None:
+                    if rand() < epsilon:
+                        action = actions[random_index()]
+                    else:
+                        row = q[state]
+                        action = row.index(max(row))
+                
+                next_state, reward, done = step(action)
+                if counts is not None:
+                    counts[state][action] += 1
+                
+                # O hook pode devolver a próxima ação já sorteada (SARSA)
+                action = learn(state, action, reward, next_state, done, epsilon)
+                
+                state = next_state
+                total_reward += reward
+                steps += 1
+            
+            if end_episode is not None:
+                end_episode()
+            
+            rewards_buf[episode] = total_reward
+            lengths_buf[episode] = steps
+            
+            if epsilon > epsilon_min:
+                epsilon *= epsilon_decay
+        
+        self.Q[:] = q
+        if end_run is not None:
+            end_run()
+        if visits is not None:
+            visits[:] = counts
+        self._finish_fast(epsilon, rewards_buf, lengths_buf)
+        
+        return rewards_buf, lengths_buf
+    
+    def _fast_hooks(self, q: List[List[float]], actions: Tuple[int, ...], rand, random_index):
+        # Passo de aprendizado do laço rápido; subclasses trocam o update sem copiar o laço
+        alpha = self.alpha
+        gamma = self.gamma
+        
+        def learn(state, action, reward, next_state, done, epsilon):
+            row = q[state]
+            current_q = row[action]
+            if done:
+                target_q = reward
+            else:
+                target_q = reward + gamma * max(q[next_state])
+            row[action] = current_q + alpha * (target_q - current_q)
+        
+        return learn, None, None
+    
+    def _fast_sampler(self):
+        actions = tuple(action.value for action in Action)
+        num_actions = len(actions)
+        
+        if self.random is None:
+            rand = random.random
+            getrandbits = random.getrandbits
+            action_bits = num_actions.bit_length()
+            
+            def random_index():
+                # Mesma sequência de random.choice(actions)
+                index = getrandbits(action_bits)
+                while index >= num_actions:
+                    index = getrandbits(action_bits)
+                return index
+        else:
+            rand = self.random.random
+            integers = self.random.integers
+            
+            def random_index():
+                return integers(0, num_actions)
+        
+        return actions, rand, random_index
+    
+    def _finish_fast(self, epsilon: float, rewards_buf: List[float], lengths_buf: List[int]):
+        self.epsilon = epsilon
+        self.total_episodes += len(rewards_buf)
+        self.stats.record_many(rewards_buf, lengths_buf)
+    
+    def train(
+        self,
+        env: BlackjackEnv,
+        num_episodes: int = 10000,
+        fast: bool = False,
+        verbose: bool = True,
+        stopping: Optional[ConvergenceMonitor] = None,
+        q_star: Optional[np.ndarray] = None,
+        q_tol: float = 0.05,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10000,
+        callbacks: Optional[Iterable[Callback]] = None,
+        profile: Optional[PhaseProfiler] = None
+    ) -> int:
+        if stopping is not None and q_star is not None:
+            raise ValueError("Use q_star/q_tol ou stopping, não ambos; passe q_star ao ConvergenceMonitor.")
+        if q_star is not None:
+            stopping = ConvergenceMonitor(q_star=q_star, q_tol=q_tol)
+        if stopping is not None:
+            stopping.reset()
+        chunk_size = stopping.check_every if stopping is not None else 1000
+        self.stop_reason = None
+        
+        callbacks = as_callback_list(callbacks)
+        per_episode = callbacks is not None and callbacks.wants_episodes
+        if callbacks is not None:
+            callbacks.begin(self)
+        
+        timed = profile.phase if profile is not None else _untimed
+        if profile is not None:
+            profile.begin()
+        
+        if verbose:
+            print(f"Iniciando treinamento por {num_episodes} episódios...")
+        
+        episode = 0
+        saved_at = None
+        next_checkpoint = checkpoint_every
+        for start in range(0, num_episodes, chunk_size):
+            chunk = min(chunk_size, num_episodes - start)
+            
+            if fast:
+                first_episode = self.total_episodes + 1
+                with timed('train_fast'):
+                    rewards, lengths = self._train_fast(env, chunk)
+                if profile is not None:
+                    profile.count_episodes(chunk)
+                if per_episode:
+                    with timed('callbacks'):
+                        callbacks.episodes_end(self, first_episode, rewards, lengths)
+            elif per_episode or profile is not None:
+                for _ in range(chunk):
+                    if profile is not None and profile.should_sample():
+                        reward, length = self._train_episode_profiled(env, profile)
+                    else:
+                        reward, length = self.train_episode(env)
+                    if per_episode:
+                        callbacks.episodes_end(self, self.total_episodes, (reward,), (length,))
+            else:
+                for _ in range(chunk):
+                    self.train_episode(env)
+            
+            episode = start + chunk
+            if stopping is not None:
+                with timed('stopping'):
+                    self.stop_reason = stopping.check(self)
+            if callbacks is not None:
+                with timed('callbacks'):
+                    callbacks.batch_end(self)
+            
+            if verbose and (episode % 1000 == 0 or self.stop_reason is not None):
+                line = (f"Episódio {episode}/{num_episodes} | "
+                        f"Recompensa média: {self.stats.avg_reward:.3f} | "
+                        f"Passos médios: {self.stats.avg_length:.2f} | "
+                        f"Epsilon: {self.epsilon:.3f}")
+                if stopping is not None and stopping.describe():
+                    line += " | " + stopping.describe()
+                print(line)
             
-            if (episode + 1) % 1000 == 0:
-                avg_reward = np.mean(self.episode_rewards[-1000:])
-                avg_steps = np.mean(self.episode_lengths[-1000:])
-                print(f"Episódio {episode + 1}/{num_episodes} | "
-                      f"Recompensa média: {avg_reward:.3f} | "
-                      f"Passos médios: {avg_steps:.2f} | "
-                      f"Epsilon: {self.epsilon:.3f}")
+            if checkpoint_path is not None and episode >= next_checkpoint:
+                with timed('checkpoint'):
+                    self.save(checkpoint_path)
+                saved_at = episode
+                if callbacks is not None:
+                    callbacks.checkpoint(self, checkpoint_path)
+                next_checkpoint = (episode // checkpoint_every + 1) * checkpoint_every
+            
+            if self.stop_reason is not None:
+                if verbose:
+                    print(f"Convergência detectada ({STOP_REASONS[self.stop_reason]}); "
+                          f"treinamento encerrado no episódio {episode}.")
+                break
+        
+        if checkpoint_path is not None and saved_at != episode:
+            with timed('checkpoint'):
+                self.save(checkpoint_path)
+            if callbacks is not None:
+                callbacks.checkpoint(self, checkpoint_path)
+        
+        if profile is not None:
+            profile.end()
+        
+        return episode
+    
+    def save(self, path: str):
+        header = {
+            'learner': self.name,
+            'learner_params': self.learner_params(),
+            'num_states': self.num_states,
+            'num_actions': self.num_actions,
+            'alpha': self.alpha,
+            'gamma': self.gamma,
+            'epsilon': self.epsilon,
+            'initial_epsilon': self.initial_epsilon,
+            'epsilon_decay': self.epsilon_decay,
+            'epsilon_min': self.epsilon_min,
+            'total_episodes': self.total_episodes,
+            'stats': self.stats.state_dict(),
+            'history_path': self.stats.history_path,
+            'rng_state': random.getstate(),
+            'agent_rng_state': self.random.get_state() if self.random is not None else None,
+        }
+        self.stats.flush()
+        write_checkpoint(path, header, {
+            'Q': self.Q,
+            'stats_rewards': self.stats.rewards,
+            'stats_lengths': self.stats.lengths,
+            **self._checkpoint_arrays(),
+        })
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = False, restore_rng: bool = False) -> 'QLearningAgent':
+        header, data_offset = read_header(path)
+        
+        agent = cls(
+            num_states=header['num_states'],
+            num_actions=header['num_actions'],
+            alpha=header['alpha'],
+            gamma=header['gamma'],
+            epsilon=header['initial_epsilon'],
+            epsilon_decay=header['epsilon_decay'],
+            epsilon_min=header['epsilon_min'],
+            stats_window=header['stats']['window'],
+            **header.get('learner_params', {})
+        )
+        agent.epsilon = header['epsilon']
+        agent.total_episodes = header['total_episodes']
+        agent.Q = read_array(path, header, data_offset, 'Q', mmap=mmap)
+        agent.stats.load_state(header['stats'],
+                               read_array(path, header, data_offset, 'stats_rewards'),
+                               read_array(path, header, data_offset, 'stats_lengths'))
+        agent.stats.history_path = header['history_path']
+        agent._restore_arrays({
+            name: read_array(path, header, data_offset, name, mmap=mmap)
+            for name in header['arrays'] if name not in CHECKPOINT_ARRAYS
+        })
+        
+        if header['agent_rng_state'] is not None:
+            agent.random = BlockRandom()
+            agent.random.set_state(header['agent_rng_state'])
+        
+        if restore_rng:
+            version, state, gauss_next = header['rng_state']
+            random.setstate((version, tuple(state), gauss_next))
+        
+        return agent
+    
+    def learner_params(self) -> dict:
+        return {}
+    
+    def _checkpoint_arrays(self) -> Dict[str, np.ndarray]:
+        # Tabelas extras do algoritmo, salvas ao lado de Q no checkpoint
+        return {}
+    
+    def _restore_arrays(self, arrays: Dict[str, np.ndarray]):
+        pass
     
     def get_policy(self) -> np.ndarray:
         return np.argmax(self.Q, axis=1)
     
     def get_stats(self) -> dict:
-        if len(self.episode_rewards) == 0:
+        if self.stats.count == 0:
             return {}
         
-        recent_rewards = self.episode_rewards[-1000:] if len(self.episode_rewards) >= 1000 else self.episode_rewards
-        
         return {
             'total_episodes': self.total_episodes,
-            'avg_reward_recent': np.mean(recent_rewards),
-            'win_rate': np.mean([r > 0 for r in recent_rewards]),
+            'avg_reward_recent': self.stats.avg_reward,
+            'avg_length_recent': self.stats.avg_length,
+            'win_rate': self.stats.win_rate,
             'epsilon': self.epsilon
         }
-
@@ -0,0 +1,89 @@
+import numpy as np
+from typing import List, Optional, Union
+
+
+SeedLike = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+
+
+def make_generator(seed: SeedLike = None) -> np.random.Generator:
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed: SeedLike, n: int) -> List[np.random.SeedSequence]:
+    if isinstance(seed, np.random.Generator):
+        seed = np.random.SeedSequence(int(seed.integers(0, 2 ** 63)))
+    elif not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+
+def spawn_generators(seed: SeedLike, n: int) -> List[np.random.Generator]:
+    return [np.random.default_rng(s) for s in spawn_seeds(seed, n)]
+
+
+class BlockRandom:
+
+    def __init__(self, seed: SeedLike = None, block_size: int = 4096):
+        self.generator = make_generator(seed)
+        self.block_size = block_size
+
+        self._uniform = []
+        self._uniform_pos = 0
+        self._uniform_state = None
+        self._integers = {}
+
+    def _refill_uniform(self):
+        self._uniform_state = self.generator.bit_generator.state
+        self._uniform = self.generator.random(self.block_size).tolist()
+        self._uniform_pos = 0
+
+    def _refill_integers(self, low: int, high: int) -> list:
+        state = self.generator.bit_generator.state
+        values = self.generator.integers(low, high, size=self.block_size).tolist()
+        buffer = self._integers[low, high] = [values, 0, state]
+        return buffer
+
+    def random(self) -> float:
+        pos = self._uniform_pos
+        if pos == len(self._uniform):
+            self._refill_uniform()
+            pos = 0
+        self._uniform_pos = pos + 1
+        return self._uniform[pos]
+
+    def integers(self, low: int, high: int) -> int:
+        buffer = self._integers.get((low, high))
+        if buffer is None or buffer[1] == len(buffer[0]):
+            buffer = self._refill_integers(low, high)
+        pos = buffer[1]
+        buffer[1] = pos + 1
+        return buffer[0][pos]
+
+    def get_state(self) -> dict:
+        return {
+            'block_size': self.block_size,
+            'generator': self.generator.bit_generator.state,
+            'uniform': [self._uniform_pos, self._uniform_state] if self._uniform_state is not None else None,
+            'integers': [[low, high, pos, state] for (low, high), (_, pos, state) in self._integers.items()],
+        }
+
+    def set_state(self, state: dict):
+        self.block_size = state['block_size']
+        self._uniform = []
+        self._uniform_pos = 0
+        self._uniform_state = None
+        self._integers = {}
+
+        if state['uniform'] is not None:
+            pos, uniform_state = state['uniform']
+            self.generator.bit_generator.state = uniform_state
+            self._refill_uniform()
+            self._uniform_pos = pos
+
+        for low, high, pos, integers_state in state['integers']:
+            self.generator.bit_generator.state = integers_state
+            self._refill_integers(low, high)[1] = pos
+
+        self.generator.bit_generator.state = state['generator']
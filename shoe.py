@@ -0,0 +1,124 @@
+import numpy as np
+from typing import Optional
+from rng import make_generator, SeedLike
+
+
+# Valores das 13 cartas de um naipe (ás = 1, figuras valem 10)
+RANK_VALUES = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10], dtype=np.int64)
+
+# Contagem Hi-Lo por valor de carta: 2-6 = +1, 7-9 = 0, 10 e ás = -1
+HI_LO = np.array([0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1], dtype=np.int16)
+
+
+def _validate(num_decks: int, penetration: float):
+    if num_decks < 1:
+        raise ValueError("num_decks deve ser >= 1.")
+    if not 0.0 < penetration <= 1.0:
+        raise ValueError("penetration deve estar em (0, 1].")
+
+
+class Shoe:
+
+    def __init__(self, num_decks: int = 6, penetration: float = 0.75, rng: SeedLike = None):
+        _validate(num_decks, penetration)
+
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.rng = make_generator(rng)
+        self.size = 52 * num_decks
+        self.cut_card = int(penetration * self.size)
+        self.shuffles = 0
+
+        self._deck = np.tile(RANK_VALUES, 4 * num_decks)
+        self.shuffle()
+
+    def shuffle(self):
+        self.rng.shuffle(self._deck)
+        self._cards = self._deck.tolist()
+        self._counts = None
+        self._pos = 0
+        self.shuffles += 1
+
+    def draw(self) -> int:
+        pos = self._pos
+        if pos == self.size:
+            self.shuffle()
+            pos = 0
+        self._pos = pos + 1
+        return self._cards[pos]
+
+    def start_round(self):
+        # A carta de corte só é respeitada entre rodadas, como no cassino
+        if self._pos >= self.cut_card:
+            self.shuffle()
+
+    @property
+    def cards_remaining(self) -> int:
+        return self.size - self._pos
+
+    @property
+    def running_count(self) -> int:
+        # Somas acumuladas calculadas só na primeira consulta após cada embaralhamento
+        if self._counts is None:
+            self._counts = np.concatenate(([0], np.cumsum(HI_LO[self._deck]))).tolist()
+        return self._counts[self._pos]
+
+    @property
+    def true_count(self) -> float:
+        return self.running_count / max(self.cards_remaining / 52, 0.5)
+
+
+class VectorShoe:
+
+    def __init__(
+        self,
+        num_tables: int,
+        num_decks: int = 6,
+        penetration: float = 0.75,
+        rng: SeedLike = None
+    ):
+        _validate(num_decks, penetration)
+
+        self.num_tables = num_tables
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.rng = make_generator(rng)
+        self.size = 52 * num_decks
+        self.cut_card = int(penetration * self.size)
+        self.shuffles = np.zeros(num_tables, dtype=np.int64)
+
+        self.cards = np.tile(RANK_VALUES, (num_tables, 4 * num_decks))
+        self.counts = np.zeros((num_tables, self.size + 1), dtype=np.int16)
+        self.pos = np.zeros(num_tables, dtype=np.int64)
+        self.shuffle()
+
+    def shuffle(self, idx: Optional[np.ndarray] = None):
+        if idx is None:
+            idx = np.arange(self.num_tables)
+        if len(idx) == 0:
+            return
+        cards = self.rng.permuted(self.cards[idx], axis=1)
+        self.cards[idx] = cards
+        self.counts[idx, 1:] = np.cumsum(HI_LO[cards], axis=1)
+        self.pos[idx] = 0
+        self.shuffles[idx] += 1
+
+    def draw(self, idx: np.ndarray) -> np.ndarray:
+        self.shuffle(idx[self.pos[idx] == self.size])
+        pos = self.pos[idx]
+        self.pos[idx] = pos + 1
+        return self.cards[idx, pos].astype(np.int64)
+
+    def start_round(self, idx: np.ndarray):
+        self.shuffle(idx[self.pos[idx] >= self.cut_card])
+
+    def running_count(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        if idx is None:
+            idx = np.arange(self.num_tables)
+        return self.counts[idx, self.pos[idx]].astype(np.int64)
+
+    def true_count(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        if idx is None:
+            idx = np.arange(self.num_tables)
+        decks_remaining = np.maximum((self.size - self.pos[idx]) / 52, 0.5)
+        return self.running_count(idx) / decks_remaining
@@ -0,0 +1,95 @@
+import time
+import numpy as np
+from collections import deque
+from typing import Optional, Tuple
+from convergence import STOP_REASONS
+
+
+def completion_message(episodes_done: int, num_episodes: int, reason: Optional[str] = None) -> str:
+    if reason is not None:
+        return f"✅ Convergência detectada após {episodes_done} episódios ({STOP_REASONS[reason]})."
+    return f"✅ Treinamento de {num_episodes} episódios concluído!"
+
+
+class TrainingHistory:
+
+    def __init__(self, maxlen: int = 1000):
+        self.episodes = deque(maxlen=maxlen)
+        self.rewards = deque(maxlen=maxlen)
+        self.win_rates = deque(maxlen=maxlen)
+        self.epsilons = deque(maxlen=maxlen)
+
+    def clear(self):
+        self.episodes.clear()
+        self.rewards.clear()
+        self.win_rates.clear()
+        self.epsilons.clear()
+
+    def record(self, stats: dict):
+        self.episodes.append(stats['total_episodes'])
+        self.rewards.append(stats['avg_reward_recent'])
+        self.win_rates.append(stats['win_rate'])
+        self.epsilons.append(stats['epsilon'])
+
+    def freeze(self) -> Tuple[tuple, tuple, tuple, tuple]:
+        return tuple(self.episodes), tuple(self.rewards), tuple(self.win_rates), tuple(self.epsilons)
+
+
+class TrainingSnapshot:
+
+    __slots__ = ('Q', 'stats', 'history', 'episode', 'num_episodes', 'finished', 'message')
+
+    def __init__(
+        self,
+        Q: np.ndarray,
+        stats: dict,
+        history: Tuple[tuple, tuple, tuple, tuple],
+        episode: int = 0,
+        num_episodes: int = 0,
+        finished: bool = False,
+        message: Optional[str] = None
+    ):
+        Q = np.array(Q, copy=True)
+        Q.flags.writeable = False
+        object.__setattr__(self, 'Q', Q)
+        object.__setattr__(self, 'stats', dict(stats))
+        object.__setattr__(self, 'history', history)
+        object.__setattr__(self, 'episode', episode)
+        object.__setattr__(self, 'num_episodes', num_episodes)
+        object.__setattr__(self, 'finished', finished)
+        object.__setattr__(self, 'message', message)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TrainingSnapshot é imutável.")
+
+    @classmethod
+    def capture(cls, agent, history: TrainingHistory, **kwargs) -> 'TrainingSnapshot':
+        return cls(agent.Q, agent.get_stats(), history.freeze(), **kwargs)
+
+    @property
+    def progress(self) -> float:
+        return 100.0 * self.episode / self.num_episodes if self.num_episodes else 0.0
+
+
+class SnapshotChannel:
+
+    def __init__(self, min_interval: float = 1.0 / 30):
+        self.min_interval = min_interval
+        # deque(maxlen=1): append/pop são atômicos no CPython, o mais novo descarta o anterior
+        self._latest = deque(maxlen=1)
+        self._last_publish = 0.0
+        self.published = 0
+
+    def publish(self, snapshot: TrainingSnapshot):
+        self._latest.append(snapshot)
+        self._last_publish = time.perf_counter()
+        self.published += 1
+
+    def due(self) -> bool:
+        return time.perf_counter() - self._last_publish >= self.min_interval
+
+    def poll(self) -> Optional[TrainingSnapshot]:
+        try:
+            return self._latest.pop()
+        except IndexError:
+            return None
@@ -0,0 +1,178 @@
+import os
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+
+class EpisodeStats:
+
+    def __init__(self, window: int = 1000, history_path: Optional[str] = None):
+        self.window = window
+        self.history_path = history_path
+
+        self.rewards = np.zeros(window, dtype=np.float64)
+        self.lengths = np.zeros(window, dtype=np.int64)
+
+        self._clear()
+
+    def reset(self):
+        self._clear()
+        if self.history_path is not None and os.path.exists(self.history_path):
+            os.remove(self.history_path)
+
+    def _clear(self):
+        self.rewards[:] = 0.0
+        self.lengths[:] = 0
+        self.count = 0
+        self.total_steps = 0
+        self.total_reward = 0.0
+        self.total_wins = 0
+        self._cursor = 0
+        self._size = 0
+        self._pending = 0
+        self._reward_sum = 0.0
+        self._length_sum = 0
+        self._win_count = 0
+
+    def state_dict(self) -> dict:
+        return {
+            'window': self.window,
+            'count': self.count,
+            'total_steps': self.total_steps,
+            'total_reward': self.total_reward,
+            'total_wins': self.total_wins,
+            'cursor': self._cursor,
+            'size': self._size,
+        }
+
+    def load_state(self, state: dict, rewards: np.ndarray, lengths: np.ndarray):
+        if state['window'] != self.window:
+            raise ValueError(f"Janela incompatível: {state['window']} != {self.window}.")
+
+        self.rewards[:] = rewards
+        self.lengths[:] = lengths
+        self.count = state['count']
+        self.total_steps = state.get('total_steps', 0)
+        self.total_reward = state.get('total_reward', 0.0)
+        self.total_wins = state.get('total_wins', 0)
+        self._cursor = state['cursor']
+        self._size = state['size']
+        self._pending = 0
+        self._recompute_sums()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, reward: float, length: int):
+        i = self._cursor
+
+        if self._size == self.window:
+            old_reward = self.rewards[i]
+            self._reward_sum -= old_reward
+            self._length_sum -= self.lengths[i]
+            if old_reward > 0:
+                self._win_count -= 1
+        else:
+            self._size += 1
+
+        self.rewards[i] = reward
+        self.lengths[i] = length
+        self._reward_sum += reward
+        self._length_sum += length
+        if reward > 0:
+            self._win_count += 1
+
+        self.count += 1
+        self.total_steps += length
+        self.total_reward += reward
+        if reward > 0:
+            self.total_wins += 1
+        self._cursor = (i + 1) % self.window
+
+        if self._cursor == 0:
+            self._recompute_sums()
+
+        if self.history_path is not None:
+            self._pending += 1
+            if self._pending == self.window:
+                self.flush()
+
+    def record_many(self, rewards: Sequence[float], lengths: Sequence[int]):
+        rewards = np.asarray(rewards, dtype=np.float64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        n = len(rewards)
+        if n == 0:
+            return
+
+        if self.history_path is not None:
+            self.flush()
+            self._write_history(rewards, lengths)
+
+        if n >= self.window:
+            self.rewards[:] = rewards[-self.window:]
+            self.lengths[:] = lengths[-self.window:]
+            self._cursor = 0
+            self._size = self.window
+        else:
+            idx = (self._cursor + np.arange(n)) % self.window
+            self.rewards[idx] = rewards
+            self.lengths[idx] = lengths
+            self._cursor = (self._cursor + n) % self.window
+            self._size = min(self.window, self._size + n)
+
+        self.count += n
+        self.total_steps += int(lengths.sum())
+        self.total_reward += float(rewards.sum())
+        self.total_wins += int(np.count_nonzero(rewards > 0))
+        self._recompute_sums()
+
+    def _recompute_sums(self):
+        rewards = self.rewards[:self._size]
+        self._reward_sum = float(rewards.sum())
+        self._length_sum = int(self.lengths[:self._size].sum())
+        self._win_count = int(np.count_nonzero(rewards > 0))
+
+    @property
+    def avg_reward(self) -> float:
+        return self._reward_sum / self._size if self._size else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self._win_count / self._size if self._size else 0.0
+
+    @property
+    def avg_length(self) -> float:
+        return self._length_sum / self._size if self._size else 0.0
+
+    def _ordered(self, values: np.ndarray, n: int) -> np.ndarray:
+        if self._size < self.window:
+            return values[self._size - n:self._size].copy()
+        ordered = np.roll(values, -self._cursor)
+        return ordered[self.window - n:]
+
+    def recent_rewards(self) -> np.ndarray:
+        return self._ordered(self.rewards, self._size)
+
+    def recent_lengths(self) -> np.ndarray:
+        return self._ordered(self.lengths, self._size)
+
+    def flush(self):
+        if self.history_path is None or self._pending == 0:
+            return
+        self._write_history(self._ordered(self.rewards, self._pending),
+                            self._ordered(self.lengths, self._pending))
+        self._pending = 0
+
+    def _write_history(self, rewards: np.ndarray, lengths: np.ndarray):
+        with open(self.history_path, 'ab') as f:
+            np.column_stack((rewards, lengths)).astype(np.float64).tofile(f)
+
+    def load_history(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.history_path is None:
+            raise ValueError("Histórico completo desativado. Informe history_path para gravá-lo em disco.")
+
+        self.flush()
+        if not os.path.exists(self.history_path):
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+        data = np.fromfile(self.history_path, dtype=np.float64).reshape(-1, 2)
+        return data[:, 0], data[:, 1].astype(np.int64)
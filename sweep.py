@@ -0,0 +1,166 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Sequence
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from rng import spawn_seeds
+
+
+PARAM_NAMES = ('alpha', 'gamma', 'epsilon', 'epsilon_decay', 'epsilon_min')
+
+RESULT_FIELDS = (
+    ('config_id', 'seed', 'num_episodes')
+    + PARAM_NAMES
+    + ('avg_reward', 'win_rate', 'avg_length', 'final_epsilon', 'policy', 'elapsed')
+)
+
+DEFAULT_PARAMS = {
+    'alpha': 0.1,
+    'gamma': 0.95,
+    'epsilon': 1.0,
+    'epsilon_decay': 0.995,
+    'epsilon_min': 0.01,
+}
+
+
+def _check_params(spec: Dict):
+    unknown = set(spec) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(unknown)}. Use {list(PARAM_NAMES)}.")
+
+
+def grid_search(spec: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    _check_params(spec)
+    names = list(spec)
+    configs = []
+    for values in itertools.product(*(spec[name] for name in names)):
+        config = dict(DEFAULT_PARAMS)
+        config.update(zip(names, values))
+        configs.append(config)
+    return configs
+
+
+def random_search(spec: Dict, num_samples: int, seed: int = 0) -> List[Dict[str, float]]:
+    _check_params(spec)
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(num_samples):
+        config = dict(DEFAULT_PARAMS)
+        for name, values in spec.items():
+            if isinstance(values, tuple):
+                low, high = values
+                config[name] = float(rng.uniform(low, high))
+            else:
+                config[name] = float(values[rng.integers(len(values))])
+        configs.append(config)
+    return configs
+
+
+def config_id(config: Dict[str, float], seed: int, num_episodes: int) -> str:
+    key = json.dumps({'params': {name: config[name] for name in PARAM_NAMES},
+                      'seed': seed, 'num_episodes': num_episodes}, sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def run_config(config: Dict[str, float], seed: int, num_episodes: int) -> Dict:
+    start = time.perf_counter()
+
+    env_seed, agent_seed = spawn_seeds(seed, 2)
+    env = BlackjackEnv(rng=env_seed)
+    agent = QLearningAgent(rng=agent_seed, **{name: config[name] for name in PARAM_NAMES})
+    agent.train(env, num_episodes, fast=True, verbose=False)
+
+    row = {
+        'config_id': config_id(config, seed, num_episodes),
+        'seed': seed,
+        'num_episodes': num_episodes,
+        'avg_reward': agent.stats.avg_reward,
+        'win_rate': agent.stats.win_rate,
+        'avg_length': agent.stats.avg_length,
+        'final_epsilon': agent.epsilon,
+        'policy': ''.join('H' if a == 0 else 'S' for a in agent.get_policy()),
+        'elapsed': time.perf_counter() - start,
+    }
+    row.update({name: config[name] for name in PARAM_NAMES})
+    return row
+
+
+def completed_ids(output_path: str) -> set:
+    if not os.path.exists(output_path):
+        return set()
+
+    done = set()
+    with open(output_path, newline='') as f:
+        for row in csv.DictReader(f):
+            if all(row.get(field) not in (None, '') for field in RESULT_FIELDS):
+                done.add(row['config_id'])
+    return done
+
+
+def _drop_partial_row(output_path: str):
+    if not os.path.exists(output_path):
+        return
+
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+def run_sweep(
+    configs: Iterable[Dict[str, float]],
+    output_path: str,
+    num_episodes: int = 10000,
+    seeds: Sequence[int] = (0,),
+    num_workers: Optional[int] = None,
+    verbose: bool = True
+) -> int:
+    _drop_partial_row(output_path)
+    done = completed_ids(output_path)
+    jobs = []
+    for config in configs:
+        for seed in seeds:
+            if config_id(config, seed, num_episodes) not in done:
+                jobs.append((config, seed))
+
+    if verbose:
+        print(f"Varredura: {len(jobs)} configurações pendentes "
+              f"({len(done)} já concluídas em {output_path})")
+
+    write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    with open(output_path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if write_header:
+            writer.writeheader()
+            f.flush()
+
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            futures = [pool.submit(run_config, config, seed, num_episodes) for config, seed in jobs]
+            for finished, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                writer.writerow(row)
+                f.flush()
+                os.fsync(f.fileno())
+
+                if verbose:
+                    print(f"[{finished}/{len(jobs)}] alpha={row['alpha']:.3f} gamma={row['gamma']:.3f} "
+                          f"epsilon_decay={row['epsilon_decay']:.4f} | "
+                          f"Recompensa média: {row['avg_reward']:.3f} | "
+                          f"Taxa de vitória: {row['win_rate'] * 100:.1f}%")
+
+    return len(jobs)
+
+
+if __name__ == "__main__":
+    configs = grid_search({
+        'alpha': [0.01, 0.05, 0.1, 0.2],
+        'gamma': [0.9, 0.95, 1.0],
+        'epsilon_decay': [0.99, 0.995, 0.999],
+    })
+    run_sweep(configs, 'sweep_results.csv', num_episodes=20000, seeds=(0, 1, 2))
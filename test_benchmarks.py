@@ -0,0 +1,23 @@
+import json
+from benchmarks import run_suite
+
+
+def test_quick_suite_is_json_serializable():
+    results = run_suite(['env', 'get_stats', 'render'], quick=True)
+
+    assert results['environment']['cpu_count'] >= 1
+    assert results['env']['vector_step'] > 0
+    assert set(results['get_stats']) == {1000, 10000}
+    assert results['render']['heatmap_update_ms'] > 0
+    assert results['render']['graphs_update_ms'] > 0
+    json.loads(json.dumps(results))
+
+
+def test_credit_assignment_covers_every_learner():
+    from benchmarks import bench_credit_assignment
+    from learners import LEARNERS
+
+    results = bench_credit_assignment(lams=(0.5, 0.9), num_seeds=1, max_episodes=500)
+
+    assert set(results) == (set(LEARNERS) - {'q_lambda'}) | {'q_lambda(0.5)', 'q_lambda(0.9)'}
+    assert all(0 < episodes <= 500 for episodes in results.values())
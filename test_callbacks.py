@@ -0,0 +1,48 @@
+import csv
+import os
+import tempfile
+import numpy as np
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from callbacks import Callback, MetricsWriter, RingBuffer
+
+
+class EpisodeLog(Callback):
+
+    def __init__(self):
+        self.episodes = []
+        self.rewards = []
+
+    def on_episode_end(self, agent, episode, reward, length):
+        self.episodes.append(episode)
+        self.rewards.append(reward)
+
+
+def test_callbacks_see_every_episode_without_changing_training():
+    for fast in (False, True):
+        plain = QLearningAgent(rng=1)
+        plain.train(BlackjackEnv(rng=2), 2500, fast=fast, verbose=False)
+
+        agent = QLearningAgent(rng=1)
+        log, ring = EpisodeLog(), RingBuffer(maxlen=2)
+        agent.train(BlackjackEnv(rng=2), 2500, fast=fast, verbose=False, callbacks=[log, ring])
+
+        assert np.array_equal(agent.Q, plain.Q)
+        assert log.episodes == list(range(1, 2501))
+        assert sum(log.rewards) == agent.stats.total_reward
+        assert len(ring) == 2
+        assert list(ring.column('episode')) == [2000, 2500]
+        assert ring.latest()['batch_episodes'] == 500
+        assert ring.latest()['batch_reward'] == sum(log.rewards[2000:])
+
+
+def test_metrics_writer_csv():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'metrics.csv')
+        agent = QLearningAgent(rng=3)
+        agent.train(BlackjackEnv(rng=4), 3000, fast=True, verbose=False, callbacks=[MetricsWriter(path)])
+
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+        assert [int(row['episode']) for row in rows] == [1000, 2000, 3000]
+        assert sum(int(row['batch_steps']) for row in rows) == agent.stats.total_steps
@@ -0,0 +1,48 @@
+import os
+import random
+import tempfile
+import numpy as np
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+
+
+def test_save_and_load():
+    random.seed(3)
+    env = BlackjackEnv()
+    agent = QLearningAgent(alpha=0.2, epsilon_decay=0.99)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agent.qlbj')
+        agent.train(env, 2500, fast=True, verbose=False, checkpoint_path=path, checkpoint_every=1000)
+        assert not os.path.exists(path + '.tmp')
+
+        expected_next = random.random()
+        loaded = QLearningAgent.load(path, restore_rng=True)
+        assert random.random() == expected_next
+
+        assert np.array_equal(loaded.Q, agent.Q)
+        assert loaded.alpha == 0.2 and loaded.epsilon_decay == 0.99
+        assert loaded.epsilon == agent.epsilon
+        assert loaded.total_episodes == agent.total_episodes == 2500
+        assert loaded.get_stats() == agent.get_stats()
+        assert np.array_equal(loaded.episode_rewards, agent.episode_rewards)
+
+        shared = QLearningAgent.load(path, mmap=True)
+        assert isinstance(shared.Q, np.memmap)
+        assert not shared.Q.flags.writeable
+        assert np.array_equal(shared.get_policy(), agent.get_policy())
+        del shared
+
+
+def test_checkpoint_restores_agent_rng():
+    env = BlackjackEnv(rng=1)
+    agent = QLearningAgent(rng=2, block_size=128)
+    agent.train(env, 700, verbose=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agent.qlbj')
+        agent.save(path)
+        loaded = QLearningAgent.load(path)
+
+    expected = [agent.random.random() for _ in range(300)]
+    assert [loaded.random.random() for _ in range(300)] == expected
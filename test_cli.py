@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import numpy as np
+import pytest
+import cli
+from cli import main
+from q_learning import QLearningAgent
+
+
+def test_cli_writes_metrics_and_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert main(['--episodes', '3000', '--log-every', '1000', '--seed', '3',
+                     '--output', tmp, '--quiet']) == 0
+
+        with open(os.path.join(tmp, 'metrics.jsonl')) as f:
+            records = [json.loads(line) for line in f]
+        assert [r['event'] for r in records] == ['config', 'progress', 'progress', 'end']
+        assert [r['episode'] for r in records[1:]] == [1000, 2000, 3000]
+        assert records[-1]['steps_per_s'] > records[-1]['episodes_per_s'] > 0
+
+        agent = QLearningAgent.load(records[-1]['checkpoint'])
+        assert agent.total_episodes == 3000
+        assert np.any(agent.Q != 0)
+
+        assert main(['--episodes', '1000', '--seed', '4', '--output', tmp,
+                     '--resume', records[-1]['checkpoint'], '--quiet']) == 0
+        assert QLearningAgent.load(records[-1]['checkpoint']).total_episodes == 4000
+
+        with pytest.raises(SystemExit):
+            main(['--episodes', '1000', '--alpha', '0.5', '--output', tmp,
+                  '--resume', records[-1]['checkpoint'], '--quiet'])
+        with open(os.path.join(tmp, 'metrics.jsonl')) as f:
+            configs = [json.loads(line) for line in f if '"config"' in line]
+        assert configs[-1]['alpha'] == 0.1 and configs[-1]['resume'] is not None
+
+
+def test_cli_resume_deals_new_hands(monkeypatch):
+    first_cards = []
+
+    class RecordingEnv(cli.BlackjackEnv):
+        def _draw_block_card(self):
+            card = super()._draw_block_card()
+            if len(first_cards[-1]) < 100:
+                first_cards[-1].append(card)
+            return card
+
+    monkeypatch.setattr(cli, 'BlackjackEnv', RecordingEnv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agent.qlbj')
+        for extra in ([], [], ['--resume', path]):
+            first_cards.append([])
+            assert main(['--episodes', '1000', '--seed', '5', '--output', tmp, '--quiet'] + extra) == 0
+
+    assert first_cards[0] == first_cards[1]
+    assert first_cards[2] != first_cards[0]
@@ -0,0 +1,20 @@
+from q_learning import QLearningAgent
+from dp_solver import build_model, value_iteration, two_card_distribution, solve
+from evaluate import evaluate, format_report
+
+
+def test_greedy_evaluation_matches_optimal_value():
+    agent = QLearningAgent()
+    agent.Q[:] = solve(gamma=1.0)
+
+    result = evaluate(agent, n_hands=400000, num_workers=2, seed=0, batch_size=100000)
+    print(format_report(result))
+
+    P, R = build_model()
+    hand_Q = value_iteration(P, R, gamma=1.0)
+    start = two_card_distribution()[2:]
+    optimal_return = start @ hand_Q.max(axis=1)
+
+    assert result['n_hands'] == 400000
+    assert abs(result['expected_return'] - optimal_return) < 2 * result['expected_return_ci']
+    assert abs(result['win_rate'] + result['tie_rate'] + result['loss_rate'] - 1.0) < 1e-12
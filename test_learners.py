@@ -0,0 +1,143 @@
+import os
+import tempfile
+import numpy as np
+import pytest
+from blackjack_env import BlackjackEnv, Action
+from learners import LEARNERS, make_agent, SarsaAgent, DoubleQAgent, MonteCarloAgent, QLambdaAgent
+from rng import spawn_seeds
+
+
+def test_learners_fast_matches_normal():
+    for name in LEARNERS:
+        tables = []
+        for fast in (False, True):
+            env_seed, agent_seed = spawn_seeds(3, 2)
+            env = BlackjackEnv(rng=env_seed)
+            agent = make_agent(name, rng=agent_seed)
+            agent.train(env, 2000, fast=fast, verbose=False)
+            tables.append(agent.Q)
+            assert agent.total_episodes == 2000
+        assert np.allclose(tables[0], tables[1]), name
+        assert np.any(tables[1] != 0), name
+
+    agent = DoubleQAgent(rng=1)
+    agent.train(BlackjackEnv(rng=2), 2000, fast=True, verbose=False)
+    assert np.allclose((agent.Q_a + agent.Q_b) / 2, agent.Q)
+    assert not np.allclose(agent.Q_a, agent.Q_b)
+
+
+def test_double_q_checkpoint_keeps_both_estimators():
+    agent = DoubleQAgent(rng=1)
+    agent.train(BlackjackEnv(rng=2), 2000, fast=True, verbose=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agent.qlbj')
+        agent.save(path)
+        loaded = DoubleQAgent.load(path)
+
+    assert np.any(agent.D != 0)
+    assert np.array_equal(loaded.Q, agent.Q) and np.array_equal(loaded.D, agent.D)
+    assert np.array_equal(loaded.Q_a, agent.Q_a) and np.array_equal(loaded.Q_b, agent.Q_b)
+
+
+def test_learners_fast_counts_visits():
+    for name in LEARNERS:
+        agent = make_agent(name, rng=0)
+        visits = np.zeros(agent.Q.shape, dtype=np.int64)
+        _, lengths = agent._train_fast(BlackjackEnv(rng=1), 500, visits=visits)
+        assert visits.sum() == sum(lengths), name
+        assert np.all(agent.Q[visits == 0] == 0), name
+
+
+def test_learners_batch_updates():
+    states = np.array([5, 5, 12, 16])
+    actions = np.array([0, 0, 1, 1])
+    rewards = np.array([0.0, -1.0, 1.0, -1.0])
+    next_states = np.array([9, 0, 0, 0])
+    dones = np.array([False, True, True, True])
+
+    for name in LEARNERS:
+        for mode in ('sequential', 'average'):
+            agent = make_agent(name, rng=0)
+            if name == 'sarsa':
+                agent.update_batch(states, actions, rewards, next_states, dones, mode=mode,
+                                   next_actions=np.array([1, 0, 0, 0]))
+            else:
+                agent.update_batch(states, actions, rewards, next_states, dones, mode=mode)
+            assert agent.Q[12, 1] > 0 and agent.Q[16, 1] < 0, (name, mode)
+
+    agent = MonteCarloAgent(gamma=1.0)
+    agent.update_batch(states, actions, rewards, next_states, dones)
+    assert np.isclose(agent.Q[5, 0], 0.1 * -1.0 + 0.9 * 0.1 * -1.0)
+
+    for agent, kwargs in ((SarsaAgent(), {}), (MonteCarloAgent(), {})):
+        with pytest.raises(ValueError):
+            agent.update_batch(states[:1], actions[:1], rewards[:1], next_states[:1], dones[:1], **kwargs)
+
+
+def test_learner_checkpoint_and_cli():
+    from cli import main
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert main(['--learner', 'expected_sarsa', '--episodes', '2000', '--seed', '1',
+                     '--output', tmp, '--quiet']) == 0
+        path = os.path.join(tmp, 'agent.qlbj')
+        agent = LEARNERS['expected_sarsa'].load(path)
+        assert agent.name == 'expected_sarsa' and agent.total_episodes == 2000
+
+        assert main(['--learner', 'expected_sarsa', '--episodes', '1000', '--resume', path,
+                     '--output', tmp, '--quiet']) == 0
+        with pytest.raises(SystemExit):
+            main(['--learner', 'sarsa', '--episodes', '1000', '--resume', path, '--output', tmp, '--quiet'])
+        with pytest.raises(SystemExit):
+            main(['--learner', 'sarsa', '--lam', '0.7', '--episodes', '1000', '--output', tmp, '--quiet'])
+
+        assert main(['--learner', 'q_lambda', '--lam', '0.7', '--episodes', '1000', '--seed', '1',
+                     '--output', tmp, '--quiet']) == 0
+        assert LEARNERS['q_lambda'].load(path).lam == 0.7
+        with pytest.raises(SystemExit):
+            main(['--learner', 'q_lambda', '--lam', '0.5', '--episodes', '1000', '--resume', path,
+                  '--output', tmp, '--quiet'])
+        assert main(['--learner', 'q_lambda', '--episodes', '1000', '--resume', path,
+                     '--output', tmp, '--quiet']) == 0
+        assert LEARNERS['q_lambda'].load(path).lam == 0.7
+
+
+def test_q_lambda_traces():
+    states, actions = np.array([5, 9]), np.array([0, 1])
+    rewards, next_states, dones = np.array([0.0, 1.0]), np.array([9, 9]), np.array([False, True])
+
+    for greedy_stand in (True, False):
+        expected = np.zeros((18, 2))
+        expected[9, 1] = 0.1
+        expected[5, 0] = 0.05 if greedy_stand else 0.02
+
+        agent = QLambdaAgent(gamma=1.0, lam=0.5)
+        batch_agent = QLambdaAgent(gamma=1.0, lam=0.5)
+        if not greedy_stand:
+            agent.Q[9, 0] = batch_agent.Q[9, 0] = expected[9, 0] = 0.2
+
+        agent.update(5, Action.HIT, 0.0, 9, False)
+        assert not np.any(agent.Q[5])
+        agent.update(9, Action.STAND, 1.0, 9, True)
+        batch_agent.update_batch(states, actions, rewards, next_states, dones)
+        assert np.allclose(agent.Q, expected) and np.allclose(batch_agent.Q, expected)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agent.qlbj')
+        QLambdaAgent(lam=0.7).save(path)
+        assert QLambdaAgent.load(path).lam == 0.7
+
+    states, actions = np.array([12, 12, 5, 9, 5, 9]), np.array([1, 1, 0, 1, 0, 1])
+    rewards = np.array([1.0, 1.0, 0.0, 1.0, 0.0, -1.0])
+    next_states, dones = np.array([0, 0, 9, 0, 9, 0]), np.array([True, True, False, True, False, True])
+    agent, batch_agent = QLambdaAgent(), QLambdaAgent()
+    for s, a, r, s2, d in zip(states, actions, rewards, next_states, dones):
+        agent.update(s, Action(a), r, s2, d)
+    batch_agent.update_batch(states, actions, rewards, next_states, dones)
+    assert np.isclose(agent.Q[12, 1], 0.19)
+    assert np.allclose(batch_agent.Q, agent.Q)
+
+    assert QLambdaAgent().lam == 0.5
+    with pytest.raises(ValueError):
+        QLambdaAgent(lam=1.5)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import parallel
+from q_learning import QLearningAgent
+from parallel import ParallelTrainer, decayed_epsilon
+
+
+def test_parallel_training():
+    agent = QLearningAgent()
+    trainer = ParallelTrainer(agent, num_workers=2, sync_every=500, merge='visits', seed=0)
+    trainer.train(3000, verbose=False)
+
+    sequential = QLearningAgent()
+    for _ in range(3000):
+        sequential.decay_epsilon()
+
+    assert agent.total_episodes == 3000
+    assert agent.stats.count == 3000
+    assert agent.epsilon == decayed_epsilon(1.0, agent.epsilon_decay, agent.epsilon_min, 3000)
+    assert np.isclose(agent.epsilon, sequential.epsilon)
+    assert np.any(agent.Q != 0)
+
+
+def test_parallel_rejects_other_learners():
+    from learners import SarsaAgent
+
+    with pytest.raises(ValueError):
+        ParallelTrainer(SarsaAgent(), num_workers=2)
+
+
+@pytest.mark.skipif(parallel.mp.get_start_method() != 'fork', reason="a substituição só chega aos processos via fork")
+def test_parallel_worker_failure_is_reported(monkeypatch):
+    worker_loop = parallel._worker_loop
+
+    def failing_loop(worker_id, *args):
+        if worker_id == 1:
+            raise MemoryError("falha simulada")
+        worker_loop(worker_id, *args)
+
+    monkeypatch.setattr(parallel, '_worker_loop', failing_loop)
+    trainer = ParallelTrainer(QLearningAgent(), num_workers=2, sync_every=500, seed=0, timeout=30)
+    with pytest.raises(RuntimeError, match=r"falharam: 1 \(código de saída 1\)"):
+        trainer.train(3000, verbose=False)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from plots import HeatmapRenderer, LearningCurvesRenderer
+
+# emojis dos títulos não existem na fonte padrão do Agg
+pytestmark = pytest.mark.filterwarnings('ignore::UserWarning')
+
+
+def _artist_ids(axes):
+    # Filhos diretos dos eixos; ticks e a colorbar são recriados pelo próprio matplotlib
+    return {id(artist) for ax in axes for artist in ax.get_children()}
+
+
+def test_heatmap_updates_existing_artists():
+    fig = Figure(figsize=(8, 4))
+    FigureCanvasAgg(fig)
+    heatmap = HeatmapRenderer(fig)
+    fig.canvas.draw()
+    artists = _artist_ids([heatmap.ax])
+
+    Q = np.linspace(2.0, 4.0, 36).reshape(18, 2)
+    heatmap.update(Q)
+    assert np.array_equal(heatmap.im.get_array(), Q.T)
+    low, high = heatmap.im.get_clim()
+    assert low < 2.0 and high > 4.0
+    assert heatmap.cells.labels[0][0] == '2.00' and heatmap.cells.labels[1][17] == '4.00'
+    assert heatmap.cells.colors[0][0] != heatmap.cells.colors[1][17]
+
+    # Sem mudança de escala a atualização vai pelo blit e redesenha as células no buffer
+    before = np.asarray(fig.canvas.buffer_rgba()).copy()
+    heatmap.update(Q[::-1])
+    assert heatmap.im.get_clim() == (low, high)
+    assert heatmap.cells.labels[0][0] == f'{Q[-1, 0]:.2f}'
+    assert not np.array_equal(np.asarray(fig.canvas.buffer_rgba()), before)
+    assert _artist_ids([heatmap.ax]) == artists
+
+
+def test_learning_curves_update_existing_artists():
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    graphs = LearningCurvesRenderer(fig, fps=1e9)
+    episodes = [100, 200, 300]
+    graphs.update(episodes, [0.1, -0.2, 0.0], [0.4, 0.5, 0.45], [1.0, 0.5, 0.25],
+                  np.zeros((18, 2)), force=True)
+    fig.canvas.draw()
+    artists = _artist_ids(graphs.all_axes)
+    fill = graphs.reward_fill
+
+    Q = np.full((18, 2), 0.5)
+    Q[:, 1] = -0.5
+    graphs.update(episodes + [400], [0.1, -0.2, 0.0, 0.3], [0.4, 0.5, 0.45, 0.6],
+                  [1.0, 0.5, 0.25, 0.1], Q, force=True)
+
+    assert list(graphs.reward_line.get_ydata()) == [0.1, -0.2, 0.0, 0.3]
+    assert list(graphs.win_line.get_xdata()) == [100, 200, 300, 400]
+    assert graphs.reward_fill is fill
+    assert np.allclose(fill.get_paths()[0].vertices[:6], [[100, 0], [100, 0.1], [200, -0.2],
+                                                          [300, 0.0], [400, 0.3], [400, 0]])
+    assert [bar.get_height() for bar in graphs.hit_bars] == [0.5] * 18
+    assert [bar.get_height() for bar in graphs.stand_bars] == [-0.5] * 18
+    assert _artist_ids(graphs.all_axes) == artists
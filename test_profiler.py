@@ -0,0 +1,34 @@
+import numpy as np
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from profiler import PhaseProfiler
+
+
+def test_profiled_training_matches_and_reports_phases():
+    plain = QLearningAgent(rng=5)
+    plain.train(BlackjackEnv(rng=6), 3000, verbose=False)
+
+    profile = PhaseProfiler(sample_every=10)
+    agent = QLearningAgent(rng=5)
+    agent.train(BlackjackEnv(rng=6), 3000, verbose=False, profile=profile)
+
+    assert np.array_equal(agent.Q, plain.Q)
+    assert profile.episodes == 3000
+    assert profile.sampled_episodes == 300
+
+    rows = {row['phase']: row for row in profile.report()}
+    assert rows['reset']['calls'] == 300
+    assert rows['step']['calls'] == rows['get_action']['calls'] == rows['update']['calls']
+    assert all(row['estimated_s'] >= 0 for row in rows.values())
+    assert 'env.step' in profile.format_report()
+
+
+def test_profile_fast_path_times_chunks():
+    profile = PhaseProfiler()
+    agent = QLearningAgent(rng=0)
+    agent.train(BlackjackEnv(rng=1), 2500, fast=True, verbose=False, profile=profile)
+
+    rows = {row['phase']: row for row in profile.report()}
+    assert rows['train_fast']['calls'] == 3
+    assert not rows['train_fast']['sampled']
+    assert profile.episodes == 2500
@@ -1,6 +1,12 @@
+import random
 import numpy as np
-from blackjack_env import BlackjackEnv, Action
+import pytest
+from blackjack_env import (BlackjackEnv, Action, NUM_PLAYER_TOTALS, EXTENDED_NUM_STATES,
+                           encode_state, decode_state, project_q)
 from q_learning import QLearningAgent
+from dp_solver import solve
+from convergence import ConvergenceMonitor
+from rng import spawn_seeds
 
 
 def test_environment():
@@ -86,6 +92,154 @@ def test_q_learning():
     print("\n")
 
 
+def test_update_batch():
+    rng = np.random.default_rng(0)
+    n = 5000
+    states = rng.integers(0, 18, size=n)
+    actions = rng.integers(0, 2, size=n)
+    rewards = rng.choice([-1.0, 0.0, 1.0], size=n)
+    next_states = rng.integers(0, 18, size=n)
+    dones = rng.random(n) < 0.5
+
+    scalar_agent = QLearningAgent()
+    for s, a, r, s2, d in zip(states, actions, rewards, next_states, dones):
+        scalar_agent.update(int(s), Action(int(a)), float(r), int(s2), bool(d))
+
+    batch_agent = QLearningAgent()
+    batch_agent.update_batch(states, actions, rewards, next_states, dones, mode='sequential')
+    assert np.array_equal(batch_agent.Q, scalar_agent.Q)
+
+    average_agent = QLearningAgent()
+    average_agent.update_batch([3, 3], [1, 1], [1.0, -1.0], [0, 0], [True, True], mode='average')
+    assert average_agent.Q[3, 1] == 0.0
+    average_agent.update_batch([3, 3], [1, 1], [1.0, 1.0], [0, 0], [True, True], mode='average')
+    assert np.isclose(average_agent.Q[3, 1], average_agent.alpha)
+
+
+def test_train_fast_matches_normal():
+    tables = []
+    for fast in (False, True):
+        random.seed(123)
+        env = BlackjackEnv()
+        agent = QLearningAgent()
+        agent.train(env, 3000, fast=fast)
+        tables.append((agent.Q.copy(), agent.epsilon, agent.total_episodes, list(agent.episode_rewards)))
+
+    assert np.array_equal(tables[0][0], tables[1][0])
+    assert tables[0][1:] == tables[1][1:]
+
+
+def test_seeded_rng_is_reproducible():
+    def run(seed, fast):
+        env_seed, agent_seed = spawn_seeds(seed, 2)
+        env = BlackjackEnv(rng=env_seed, block_size=64)
+        agent = QLearningAgent(rng=agent_seed, block_size=64)
+        agent.train(env, 2000, fast=fast, verbose=False)
+        return agent.Q.copy()
+
+    assert np.array_equal(run(5, fast=False), run(5, fast=True))
+    assert np.array_equal(run(5, fast=True), run(5, fast=True))
+    assert not np.array_equal(run(5, fast=True), run(6, fast=True))
+
+
+def test_optimal_q_and_early_stop():
+    Q_star = solve(gamma=0.95)
+    assert Q_star.shape == (18, 2)
+    assert np.isclose(Q_star[17, 0], -1.0)
+    assert np.argmax(Q_star[0]) == Action.HIT.value
+    assert np.argmax(Q_star[17]) == Action.STAND.value
+
+    random.seed(7)
+    env = BlackjackEnv()
+    agent = QLearningAgent()
+    agent.Q[:] = Q_star
+    episodes = agent.train(env, 10000, fast=True, verbose=False, q_star=Q_star, q_tol=1.0)
+    assert episodes == 1000
+    assert agent.stop_reason == 'q_star'
+
+    with pytest.raises(ValueError):
+        agent.train(env, 1000, fast=True, verbose=False, q_star=Q_star, stopping=ConvergenceMonitor())
+
+
+def test_convergence_stopping():
+    random.seed(11)
+    env = BlackjackEnv()
+    agent = QLearningAgent()
+    monitor = ConvergenceMonitor(policy_patience=3, check_every=500)
+
+    episodes = agent.train(env, 200000, fast=True, verbose=False, stopping=monitor)
+    assert episodes < 200000
+    assert agent.stop_reason == 'policy'
+    assert episodes % 500 == 0
+
+
+def test_extended_state_encoding():
+    states = {encode_state(v, card, ace) for v in range(4, 22) for card in range(1, 11) for ace in (False, True)}
+    assert states == set(range(EXTENDED_NUM_STATES))
+    for state in range(EXTENDED_NUM_STATES):
+        assert encode_state(*decode_state(state)) == state
+
+    env = BlackjackEnv(rng=3, extended_state=True)
+    env.player_hand, env.player_ace, env.dealer_hand = 7, True, 6
+    assert decode_state(env._get_extended_state()) == (17, 6, True)
+    env.player_hand = 17
+    assert decode_state(env._get_extended_state()) == (17, 6, False)
+
+    for _ in range(2000):
+        state = env.reset()
+        while not env.done:
+            assert 0 <= state < EXTENDED_NUM_STATES
+            state, reward, done = env.step_fast(random.randrange(2))
+
+    Q = np.zeros((EXTENDED_NUM_STATES, 2))
+    Q[encode_state(20, 10, False), 1] = 13.0
+    projected = project_q(Q)
+    assert projected.shape == (NUM_PLAYER_TOTALS, 2)
+    assert np.isclose(projected[16, 1], 4.0)
+
+
+def test_extended_state_training():
+    def run(fast):
+        env_seed, agent_seed = spawn_seeds(9, 2)
+        env = BlackjackEnv(rng=env_seed, extended_state=True)
+        agent = QLearningAgent(num_states=env.num_states, rng=agent_seed)
+        agent.train(env, 2000, fast=fast, verbose=False)
+        return agent.Q
+
+    Q = run(fast=False)
+    assert Q.shape == (EXTENDED_NUM_STATES, 2)
+    assert np.array_equal(Q, run(fast=True))
+
+
+def test_dealer_modes():
+    from dp_solver import dealer_final_distribution, stand_reward, dealer_outcome_distribution
+
+    env = BlackjackEnv(rng=4, dealer_mode='sample')
+    counts = np.zeros(6)
+    for _ in range(20000):
+        env.reset()
+        env.dealer_hand, env.dealer_hidden, env.player_hand = 6, 10, 18
+        env.step_fast(Action.STAND.value)
+        counts[5 if env.dealer_total == -1 else env.dealer_total - 17] += 1
+    assert np.allclose(counts / counts.sum(), dealer_final_distribution(16), atol=0.02)
+
+    env = BlackjackEnv(rng=5, dealer_mode='expected')
+    dealer_dist = dealer_outcome_distribution()
+    rewards = []
+    for _ in range(20000):
+        env.reset()
+        env.player_hand = 19
+        state, reward, done, info = env.step(Action.STAND)
+        assert done and info['result'] == 'expected'
+        rewards.append(reward)
+    assert abs(np.mean(rewards) - stand_reward(19, dealer_dist)) < 0.01
+
+    for kwargs in (dict(dealer_mode='fast'), dict(dealer_mode='sample', extended_state=True),
+                   dict(dealer_mode='expected', num_decks=6)):
+        with pytest.raises(ValueError):
+            BlackjackEnv(**kwargs)
+
+
 if __name__ == "__main__":
     test_environment()
     
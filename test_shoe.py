@@ -0,0 +1,48 @@
+import numpy as np
+from blackjack_env import BlackjackEnv, Action
+from vector_env import VectorBlackjackEnv
+from q_learning import QLearningAgent
+from shoe import Shoe, VectorShoe
+
+
+def test_shoe_deals_every_card_and_reshuffles_at_cut():
+    shoe = Shoe(num_decks=2, penetration=1.0, rng=0)
+    cards = [shoe.draw() for _ in range(104)]
+    assert sorted(cards) == sorted(list(range(1, 10)) * 8 + [10] * 32)
+    assert shoe.running_count == 0 and shoe.cards_remaining == 0
+    assert shoe.shuffles == 1
+
+    shoe = Shoe(num_decks=1, penetration=0.5, rng=0)
+    for _ in range(30):
+        shoe.draw()
+    count = sum({2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 1: -1, 10: -1}.get(card, 0) for card in shoe._cards[:30])
+    assert shoe.running_count == count
+    shoe.start_round()
+    assert shoe.shuffles == 2 and shoe.cards_remaining == 52
+
+    env = BlackjackEnv(rng=1, num_decks=6)
+    agent = QLearningAgent(rng=2)
+    agent.train(env, 5000, fast=True, verbose=False)
+    assert env.shoe.shuffles > 1
+    env.reset()
+    state, reward, done, info = env.step(Action.STAND)
+    assert 'true_count' in info
+
+
+def test_vector_shoe():
+    env = VectorBlackjackEnv(num_envs=64, rng=0, num_decks=1)
+    assert isinstance(env.shoe, VectorShoe)
+
+    for _ in range(200):
+        states, rewards, dones, info = env.step(np.where(env.player_hand < 17, 0, 1))
+        assert np.all(env.shoe.pos <= env.shoe.size)
+    assert np.all(env.shoe.shuffles > 1)
+    assert info['true_count'].shape == (64,)
+
+    shoe = VectorShoe(num_tables=3, num_decks=1, penetration=1.0, rng=0)
+    idx = np.arange(3)
+    cards = np.stack([shoe.draw(idx) for _ in range(52)], axis=1)
+    for row in cards:
+        assert sorted(row.tolist()) == sorted(list(range(1, 10)) * 4 + [10] * 16)
+    assert not np.array_equal(cards[0], cards[1])
+    assert np.all(shoe.running_count() == 0)
@@ -0,0 +1,55 @@
+import threading
+import numpy as np
+import pytest
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from snapshot import TrainingHistory, TrainingSnapshot, SnapshotChannel
+
+
+def test_snapshot_is_an_immutable_copy():
+    agent = QLearningAgent(rng=0)
+    env = BlackjackEnv(rng=1)
+    history = TrainingHistory(maxlen=3)
+    for _ in range(5):
+        agent.train(env, 100, fast=True, verbose=False)
+        history.record(agent.get_stats())
+
+    snapshot = TrainingSnapshot.capture(agent, history, episode=500, num_episodes=1000)
+    agent.Q[:] = 0.0
+
+    assert snapshot.history[0] == (300, 400, 500)
+    assert snapshot.progress == 50.0
+    assert np.any(snapshot.Q != 0.0)
+    with pytest.raises(ValueError):
+        snapshot.Q[0, 0] = 1.0
+    with pytest.raises(AttributeError):
+        snapshot.episode = 0
+
+
+def test_channel_keeps_only_latest():
+    channel = SnapshotChannel(min_interval=0.0)
+    assert channel.poll() is None
+
+    stop = threading.Event()
+
+    def produce():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            channel.publish(TrainingSnapshot(np.full((18, 2), float(i)), {}, (), episode=i))
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    seen = []
+    while len(seen) < 50:
+        snapshot = channel.poll()
+        if snapshot is not None:
+            assert np.all(snapshot.Q == snapshot.episode)
+            seen.append(snapshot.episode)
+    stop.set()
+    producer.join()
+
+    assert seen == sorted(seen)
+    last = channel.poll()
+    assert last is None or last.episode > seen[-1]
+    assert channel.poll() is None
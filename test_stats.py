@@ -0,0 +1,59 @@
+import os
+import tempfile
+import numpy as np
+from stats import EpisodeStats
+
+
+def test_ring_buffer_matches_full_history():
+    rng = np.random.default_rng(0)
+    rewards = rng.choice([-1.0, 0.0, 1.0], size=2500)
+    lengths = rng.integers(1, 6, size=2500)
+
+    stats = EpisodeStats(window=1000)
+    for r, l in zip(rewards[:1700], lengths[:1700]):
+        stats.record(r, l)
+    stats.record_many(rewards[1700:], lengths[1700:])
+
+    assert stats.count == 2500
+    assert stats.total_steps == lengths.sum()
+    assert len(stats) == 1000
+    assert np.array_equal(stats.recent_rewards(), rewards[-1000:])
+    assert np.isclose(stats.avg_reward, rewards[-1000:].mean())
+    assert np.isclose(stats.win_rate, np.mean(rewards[-1000:] > 0))
+    assert np.isclose(stats.avg_length, lengths[-1000:].mean())
+
+
+def test_history_spills_to_disk():
+    rng = np.random.default_rng(1)
+    rewards = rng.choice([-1.0, 0.0, 1.0], size=350)
+    lengths = rng.integers(1, 6, size=350)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.bin')
+        stats = EpisodeStats(window=100, history_path=path)
+
+        for r, l in zip(rewards[:120], lengths[:120]):
+            stats.record(r, l)
+        stats.record_many(rewards[120:300], lengths[120:300])
+        for r, l in zip(rewards[300:], lengths[300:]):
+            stats.record(r, l)
+
+        saved_rewards, saved_lengths = stats.load_history()
+        assert np.array_equal(saved_rewards, rewards)
+        assert np.array_equal(saved_lengths, lengths)
+
+
+def test_history_is_appended_until_explicit_reset():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.bin')
+        stats = EpisodeStats(window=10, history_path=path)
+        stats.record_many([1.0, -1.0], [1, 2])
+
+        stats = EpisodeStats(window=10, history_path=path)
+        stats.record_many([0.0], [3])
+        rewards, lengths = stats.load_history()
+        assert np.array_equal(rewards, [1.0, -1.0, 0.0])
+        assert np.array_equal(lengths, [1, 2, 3])
+
+        stats.reset()
+        assert not os.path.exists(path)
@@ -0,0 +1,26 @@
+import csv
+import os
+import tempfile
+from sweep import grid_search, random_search, run_sweep
+
+
+def test_sweep_is_resumable():
+    configs = grid_search({'alpha': [0.05, 0.1], 'epsilon_decay': [0.99, 0.995]})
+    assert len(configs) == 4
+    assert len(random_search({'alpha': (0.01, 0.5), 'gamma': [0.9, 1.0]}, 3)) == 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sweep.csv')
+
+        assert run_sweep(configs[:2], path, num_episodes=500, num_workers=2, verbose=False) == 2
+
+        with open(path, 'a') as f:
+            f.write('corrompido,0')
+
+        assert run_sweep(configs, path, num_episodes=500, num_workers=2, verbose=False) == 2
+        assert run_sweep(configs, path, num_episodes=500, num_workers=2, verbose=False) == 0
+
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 4
+        assert len({row['config_id'] for row in rows}) == 4
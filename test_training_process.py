@@ -0,0 +1,44 @@
+import time
+import numpy as np
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from rng import spawn_seeds
+from training_process import TrainingProcess
+
+
+def _wait_finished(trainer: TrainingProcess, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        snapshot = trainer.poll()
+        if snapshot is not None and snapshot.finished:
+            return snapshot
+        time.sleep(0.01)
+    raise TimeoutError
+
+
+def test_process_matches_headless_training():
+    trainer = TrainingProcess({'alpha': 0.1, 'epsilon_decay': 0.999}, seed=7)
+    try:
+        trainer.train(5000)
+        snapshot = _wait_finished(trainer)
+
+        env_seed, agent_seed = spawn_seeds(7, 2)
+        agent = QLearningAgent(alpha=0.1, epsilon_decay=0.999, rng=agent_seed)
+        agent.train(BlackjackEnv(rng=env_seed), 5000, fast=True, verbose=False)
+
+        assert snapshot.episode == 5000
+        assert snapshot.stats['total_episodes'] == 5000
+        assert np.array_equal(snapshot.Q, agent.Q)
+        assert snapshot.history[0] == tuple(range(100, 5001, 100))
+
+        trainer.reset()
+        deadline = time.time() + 10
+        snapshot = None
+        while snapshot is None and time.time() < deadline:
+            snapshot = trainer.poll()
+        assert not snapshot.Q.any()
+        assert snapshot.stats == {}
+    finally:
+        trainer.close()
+
+    assert not trainer.process.is_alive()
@@ -0,0 +1,39 @@
+import numpy as np
+from vector_env import VectorBlackjackEnv, RESULT_NONE, RESULT_BUST
+
+
+def test_vector_environment():
+    env = VectorBlackjackEnv(num_envs=4096, rng=0)
+    states = env.reset()
+
+    assert states.shape == (4096,)
+    assert states.min() >= 0 and states.max() < env.num_states
+
+    total_reward = 0.0
+    finished = 0
+    for _ in range(50):
+        actions = np.where(env.player_hand < 17, 0, 1)
+        states, rewards, dones, info = env.step(actions)
+
+        assert set(np.unique(rewards)).issubset({-1.0, 0.0, 1.0})
+        assert np.all(info['result'][~dones] == RESULT_NONE)
+        assert np.all(info['result'][dones] != RESULT_NONE)
+        assert np.all(rewards[info['result'] == RESULT_BUST] == -1.0)
+
+        total_reward += rewards.sum()
+        finished += dones.sum()
+
+    print(f"Episódios: {finished} | Recompensa média: {total_reward / finished:.3f}")
+    assert finished > 4096
+
+
+def test_vector_environment_without_autoreset():
+    env = VectorBlackjackEnv(num_envs=256, rng=1, autoreset=False)
+    env.reset()
+
+    states, rewards, dones, info = env.step(np.ones(256, dtype=np.int64))
+    assert np.all(dones) and np.all(env.done)
+
+    states, rewards, dones, info = env.step(np.zeros(256, dtype=np.int64))
+    assert not np.any(dones)
+    assert np.all(rewards == 0.0)
@@ -0,0 +1,235 @@
+import multiprocessing as mp
+import time
+import numpy as np
+from typing import Optional
+from blackjack_env import BlackjackEnv
+from q_learning import QLearningAgent
+from convergence import ConvergenceMonitor, STOP_REASONS
+from parallel import SharedArray
+from rng import spawn_seeds, SeedLike
+from snapshot import TrainingHistory, TrainingSnapshot, completion_message
+
+
+HISTORY_EVERY = 100
+
+SEQ = 0
+EPISODE = 1
+NUM_EPISODES = 2
+FINISHED = 3
+REASON = 4
+HAS_STATS = 5
+TOTAL_EPISODES = 6
+AVG_REWARD = 7
+AVG_LENGTH = 8
+WIN_RATE = 9
+EPSILON = 10
+HISTORY_LEN = 11
+HEADER_SIZE = 12
+
+REASON_CODES = list(STOP_REASONS)
+
+
+def _buffer_size(num_states: int, num_actions: int, history_len: int) -> int:
+    return HEADER_SIZE + num_states * num_actions + 4 * history_len
+
+
+def _publish(buffer: np.ndarray, agent: QLearningAgent, history: TrainingHistory,
+             episode: int = 0, num_episodes: int = 0, finished: bool = False, reason: Optional[str] = None):
+    q_end = HEADER_SIZE + agent.Q.size
+    history_len = history.episodes.maxlen
+    seq = buffer[SEQ]
+
+    # seqlock: sequência ímpar enquanto a escrita está em andamento
+    buffer[SEQ] = seq + 1
+    buffer[EPISODE] = episode
+    buffer[NUM_EPISODES] = num_episodes
+    buffer[FINISHED] = finished
+    buffer[REASON] = REASON_CODES.index(reason) if reason is not None else -1
+
+    stats = agent.get_stats()
+    buffer[HAS_STATS] = bool(stats)
+    if stats:
+        buffer[TOTAL_EPISODES] = stats['total_episodes']
+        buffer[AVG_REWARD] = stats['avg_reward_recent']
+        buffer[AVG_LENGTH] = stats['avg_length_recent']
+        buffer[WIN_RATE] = stats['win_rate']
+        buffer[EPSILON] = stats['epsilon']
+
+    buffer[HEADER_SIZE:q_end] = agent.Q.ravel()
+    n = len(history.episodes)
+    buffer[HISTORY_LEN] = n
+    rows = buffer[q_end:].reshape(4, history_len)
+    for row, values in zip(rows, (history.episodes, history.rewards, history.win_rates, history.epsilons)):
+        row[:n] = values
+
+    buffer[SEQ] = seq + 2
+
+
+def _serve(conn, spec, agent_kwargs: dict, env_kwargs: dict, seed: SeedLike, history_len: int, min_interval: float):
+    shared = SharedArray.attach(spec)
+    try:
+        _serve_loop(conn, shared.array, agent_kwargs, env_kwargs, seed, history_len, min_interval)
+    finally:
+        shared.close()
+        conn.close()
+
+
+def _serve_loop(conn, buffer: np.ndarray, agent_kwargs: dict, env_kwargs: dict, seed: SeedLike,
+                history_len: int, min_interval: float):
+    env_seed, agent_seed = spawn_seeds(seed, 2) if seed is not None else (None, None)
+    env = BlackjackEnv(rng=env_seed, **env_kwargs)
+    agent = QLearningAgent(rng=agent_seed, **agent_kwargs)
+    history = TrainingHistory(maxlen=history_len)
+    _publish(buffer, agent, history)
+
+    while True:
+        command, *args = conn.recv()
+        if command == 'train':
+            num_episodes, monitor_kwargs = args
+            if _run(conn, buffer, agent, env, history, num_episodes, monitor_kwargs, min_interval):
+                break
+        elif command == 'reset':
+            agent.reset()
+            history.clear()
+            _publish(buffer, agent, history)
+        elif command == 'shutdown':
+            break
+
+
+def _run(conn, buffer: np.ndarray, agent: QLearningAgent, env: BlackjackEnv, history: TrainingHistory,
+         num_episodes: int, monitor_kwargs: Optional[dict], min_interval: float) -> bool:
+    monitor = ConvergenceMonitor(**monitor_kwargs) if monitor_kwargs else None
+    reason = None
+    done = 0
+    last_publish = time.perf_counter()
+
+    while done < num_episodes:
+        if conn.poll():
+            command = conn.recv()[0]
+            if command == 'shutdown':
+                return True
+            if command == 'stop':
+                break
+
+        n = min(HISTORY_EVERY - agent.total_episodes % HISTORY_EVERY, num_episodes - done)
+        if monitor is not None:
+            n = min(n, monitor.check_every - done % monitor.check_every)
+        agent._train_fast(env, n)
+        done += n
+
+        if agent.total_episodes % HISTORY_EVERY == 0:
+            history.record(agent.get_stats())
+
+        if monitor is not None and done % monitor.check_every == 0:
+            reason = monitor.check(agent)
+            if reason is not None:
+                break
+
+        now = time.perf_counter()
+        if now - last_publish >= min_interval:
+            _publish(buffer, agent, history, done, num_episodes)
+            last_publish = now
+
+    _publish(buffer, agent, history, done, num_episodes, finished=True, reason=reason)
+    return False
+
+
+class TrainingProcess:
+
+    def __init__(
+        self,
+        agent_kwargs: Optional[dict] = None,
+        env_kwargs: Optional[dict] = None,
+        seed: SeedLike = None,
+        history_len: int = 1000,
+        min_interval: float = 1.0 / 30
+    ):
+        self.agent_kwargs = dict(agent_kwargs or {})
+        self.env_kwargs = dict(env_kwargs or {})
+        self.num_states = self.agent_kwargs.get('num_states', 18)
+        self.num_actions = self.agent_kwargs.get('num_actions', 2)
+        self.history_len = history_len
+
+        size = _buffer_size(self.num_states, self.num_actions, history_len)
+        self.shared = SharedArray((size,), np.float64)
+        self._last_seq = -1.0
+
+        # spawn: o processo pai já tem Tk e threads carregados, fork não é seguro
+        context = mp.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_serve,
+            args=(child_conn, self.shared.spec, self.agent_kwargs, self.env_kwargs, seed, history_len, min_interval),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def train(self, num_episodes: int, monitor_kwargs: Optional[dict] = None):
+        self.conn.send(('train', num_episodes, monitor_kwargs))
+
+    def stop(self):
+        self.conn.send(('stop',))
+
+    def reset(self):
+        self.conn.send(('reset',))
+
+    def poll(self, retries: int = 100) -> Optional[TrainingSnapshot]:
+        buffer = self.shared.array
+        for _ in range(retries):
+            seq = buffer[SEQ]
+            if seq == self._last_seq:
+                return None
+            if seq % 2 == 1:
+                continue
+            data = buffer.copy()
+            if buffer[SEQ] == seq:
+                break
+        else:
+            return None
+
+        self._last_seq = seq
+        return self._decode(data)
+
+    def _decode(self, data: np.ndarray) -> TrainingSnapshot:
+        q_end = HEADER_SIZE + self.num_states * self.num_actions
+        Q = data[HEADER_SIZE:q_end].reshape(self.num_states, self.num_actions)
+
+        n = int(data[HISTORY_LEN])
+        rows = data[q_end:].reshape(4, self.history_len)[:, :n]
+        episodes = tuple(int(e) for e in rows[0])
+        history = (episodes,) + tuple(tuple(row.tolist()) for row in rows[1:])
+
+        stats = {}
+        if data[HAS_STATS]:
+            stats = {
+                'total_episodes': int(data[TOTAL_EPISODES]),
+                'avg_reward_recent': float(data[AVG_REWARD]),
+                'avg_length_recent': float(data[AVG_LENGTH]),
+                'win_rate': float(data[WIN_RATE]),
+                'epsilon': float(data[EPSILON]),
+            }
+
+        episode = int(data[EPISODE])
+        num_episodes = int(data[NUM_EPISODES])
+        finished = bool(data[FINISHED])
+        message = None
+        if finished:
+            code = int(data[REASON])
+            message = completion_message(episode, num_episodes, REASON_CODES[code] if code >= 0 else None)
+
+        return TrainingSnapshot(Q, stats, history, episode=episode, num_episodes=num_episodes,
+                                finished=finished, message=message)
+
+    def close(self, timeout: float = 5.0):
+        if self.process.is_alive():
+            try:
+                self.conn.send(('shutdown',))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.conn.close()
+        self.shared.close()
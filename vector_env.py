@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+from rng import make_generator, SeedLike
+from shoe import VectorShoe
+
+
+RESULT_NONE = 0
+RESULT_BUST = 1
+RESULT_DEALER_BUST = 2
+RESULT_DEALER_WINS = 3
+RESULT_PLAYER_WINS = 4
+RESULT_TIE = 5
+
+RESULT_NAMES = {
+    RESULT_NONE: None,
+    RESULT_BUST: 'bust',
+    RESULT_DEALER_BUST: 'dealer_bust',
+    RESULT_DEALER_WINS: 'dealer_wins',
+    RESULT_PLAYER_WINS: 'player_wins',
+    RESULT_TIE: 'tie',
+}
+
+
+class VectorBlackjackEnv:
+
+    NUM_STATES = 18
+
+    def __init__(
+        self,
+        num_envs: int = 1024,
+        rng: SeedLike = None,
+        autoreset: bool = True,
+        num_decks: Optional[int] = None,
+        penetration: float = 0.75
+    ):
+        self.num_envs = num_envs
+        self.num_states = self.NUM_STATES
+        self.num_actions = 2
+        self.autoreset = autoreset
+
+        self.rng = make_generator(rng)
+        self.shoe = None
+        if num_decks is not None:
+            self.shoe = VectorShoe(num_envs, num_decks, penetration, rng=self.rng)
+
+        self.player_hand = np.zeros(num_envs, dtype=np.int64)
+        self.dealer_hand = np.zeros(num_envs, dtype=np.int64)
+        self.dealer_hidden = np.zeros(num_envs, dtype=np.int64)
+        self.done = np.zeros(num_envs, dtype=bool)
+
+        self.reset()
+
+    def _draw_cards(self, size: int) -> np.ndarray:
+        cards = self.rng.integers(1, 14, size=size)
+        return np.minimum(cards, 10)
+
+    def _draw(self, idx: np.ndarray) -> np.ndarray:
+        if self.shoe is None:
+            return self._draw_cards(len(idx))
+        return self.shoe.draw(idx)
+
+    def _deal(self, idx: np.ndarray):
+        if self.shoe is None:
+            cards = self._draw_cards(4 * len(idx)).reshape(4, len(idx))
+        else:
+            self.shoe.start_round(idx)
+            cards = [self.shoe.draw(idx) for _ in range(4)]
+        self.player_hand[idx] = cards[0] + cards[1]
+        self.dealer_hand[idx] = cards[2]
+        self.dealer_hidden[idx] = cards[3]
+        self.done[idx] = False
+
+    def reset(self) -> np.ndarray:
+        self._deal(np.arange(self.num_envs))
+        return self._get_states()
+
+    def _get_states(self) -> np.ndarray:
+        return np.clip(self.player_hand, 4, 21) - 4
+
+    def _dealer_totals(self, idx: np.ndarray) -> np.ndarray:
+        totals = self.dealer_hand[idx] + self.dealer_hidden[idx]
+        drawing = np.flatnonzero(totals < 17)
+        while len(drawing) > 0:
+            totals[drawing] += self._draw(idx[drawing])
+            drawing = drawing[totals[drawing] < 17]
+        totals[totals > 21] = -1
+        return totals
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
+        actions = np.asarray(actions)
+        active = ~self.done
+
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        results = np.full(self.num_envs, RESULT_NONE, dtype=np.int8)
+
+        hit = np.flatnonzero(active & (actions == 0))
+        if len(hit) > 0:
+            self.player_hand[hit] += self._draw(hit)
+            bust = hit[self.player_hand[hit] > 21]
+            self.done[bust] = True
+            rewards[bust] = -1.0
+            results[bust] = RESULT_BUST
+
+        stand = np.flatnonzero(active & (actions == 1))
+        if len(stand) > 0:
+            self.done[stand] = True
+            dealer_totals = self._dealer_totals(stand)
+            player_totals = self.player_hand[stand]
+
+            dealer_bust = dealer_totals == -1
+            dealer_wins = ~dealer_bust & (dealer_totals > player_totals)
+            player_wins = ~dealer_bust & (dealer_totals < player_totals)
+            tie = ~dealer_bust & (dealer_totals == player_totals)
+
+            rewards[stand[dealer_bust | player_wins]] = 1.0
+            rewards[stand[dealer_wins]] = -1.0
+            results[stand[dealer_bust]] = RESULT_DEALER_BUST
+            results[stand[dealer_wins]] = RESULT_DEALER_WINS
+            results[stand[player_wins]] = RESULT_PLAYER_WINS
+            results[stand[tie]] = RESULT_TIE
+
+        dones = active & self.done
+        terminal_states = self._get_states()
+
+        if self.autoreset:
+            finished = np.flatnonzero(dones)
+            if len(finished) > 0:
+                self._deal(finished)
+            states = self._get_states()
+        else:
+            states = terminal_states
+
+        info = {
+            'result': results,
+            'terminal_states': terminal_states,
+        }
+        if self.shoe is not None:
+            info['true_count'] = self.shoe.true_count()
+
+        return states, rewards, dones, info